@@ -3,18 +3,168 @@ Provides an application factory that constructs and configures a
 Flask instance used to server the Borealis site.
 """
 
+import atexit
+import concurrent.futures
+import json
 import logging
-from typing import Optional, Dict
+import math
+import threading
+from datetime import datetime, timedelta
+from functools import lru_cache
+import os
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit, urlunsplit
 import time
 
 try:
     from flask import Flask, Response, render_template, jsonify, request, send_from_directory
+    from flask.json.provider import DefaultJSONProvider
 except Exception as exc:
     raise RuntimeError(
         "Flask is required to run the local config site. "
         "Install with: pip install Flask"
     ) from exc
 
+import requests
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from services.data_models import Item
+from services.jellyfin import create_client, create_http_session
+from services.mappers import map_users, map_libraries
+from services.repository import Repository
+from services.settings_store import SettingsService, server_configured
+from services.sync_scheduler import SyncScheduler
+from services.sync_service import SyncService
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    JSON provider backed by orjson. Output matches the default provider
+    (sorted keys, same fallbacks for unsupported types) but is encoded
+    in C and written to the response as bytes. Dates and dataclasses
+    are passed through to Flask's default so datetimes stay HTTP dates.
+    """
+
+    _options = (
+        orjson.OPT_SORT_KEYS
+        | orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+    ) if orjson else 0
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(
+            obj, default=self.default, option=self._options
+        ).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=self._options),
+            mimetype=self.mimetype,
+        )
+
+
+def _limit_arg(default: int, maximum: int) -> int:
+    """
+    Read the ?limit= query argument, falling back to default when it is
+    missing or outside 1..maximum.
+    """
+    limit = request.args.get("limit", default, type=int)
+    if limit < 1 or limit > maximum:
+        return default
+    return limit
+
+
+def _validation_error(message: str) -> bytes:
+    """
+    Pre-encode a fixed test-connection validation error body.
+    """
+    return json.dumps(
+        {"message": message, "ok": False, "status": 400},
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+# Validation failures never vary, so their bodies are encoded once
+_ERR_MISSING_STORED = _validation_error(
+    "Missing host, port, or API key in settings."
+)
+_ERR_PORT_STORED = _validation_error("Stored port must be numeric.")
+_ERR_MISSING_GIVEN = _validation_error("Missing host, port, or API key.")
+_ERR_PORT_GIVEN = _validation_error("Port must be numeric.")
+
+
+def _static_json(body: bytes) -> Response:
+    return Response(body, mimetype="application/json")
+
+
+@lru_cache(maxsize=32)
+def _system_info_url(host: str, port: str) -> str:
+    """
+    Build the /System/Info URL for a user-supplied host and port.
+    The host may carry an http:// or https:// prefix.
+    """
+    try:
+        parts = urlsplit(host if "://" in host else f"http://{host}")
+    except ValueError:
+        base = host if "://" in host else f"http://{host}"
+        return f"{base}:{port}/System/Info"
+    scheme = "https" if parts.scheme.lower() == "https" else "http"
+    hostname = parts.hostname or host
+    if ":" in hostname:
+        hostname = f"[{hostname}]"
+    return urlunsplit((scheme, f"{hostname}:{port}", "/System/Info", "", ""))
+
+
+def _probe_jellyfin(
+    http: requests.Session, host: str, port: str, token: str
+) -> Dict:
+    """
+    Request /System/Info with the given credentials and return the
+    result envelope used by the test-connection endpoints.
+    """
+    try:
+        resp = http.get(
+            _system_info_url(host, port),
+            headers={
+                "X-Emby-Token": token,
+                "Accept": "application/json",
+            },
+            timeout=3.0,
+        )
+    except requests.RequestException as exc:
+        return {
+            "ok": False,
+            "status": 0,
+            "message": f"Network error: {exc}"
+        }
+    except Exception as exc:
+        return {
+            "ok": False,
+            "status": 0,
+            "message": f"Unexpected error: {str(exc)}"
+        }
+
+    status = resp.status_code
+    if 200 <= status < 300:
+        return {"ok": True, "status": status}
+    return {
+        "ok": False,
+        "status": status,
+        "message": (
+            f"HTTP error from Jellyfin ({status}): "
+            f"{resp.reason or 'Unknown'}"
+        )
+    }
+
 
 def create_app(test_config: Optional[Dict] = None) -> "Flask":
     """
@@ -28,12 +178,16 @@ def create_app(test_config: Optional[Dict] = None) -> "Flask":
         static_folder="static",
         template_folder="templates",
     )
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
 
     app.config.setdefault("DEBUG", False)
     app.config.setdefault("PORT", 2929)
     app.config.setdefault("DATABASE_URL", "sqlite:///borealis.db")
     app.config.setdefault("ENCRYPTION_KEY_PATH", "secret.key")
     app.config.setdefault("DATA_DATABASE_URL", "sqlite:///borealis_data.db")
+    app.config.setdefault("ASSETS_MAX_AGE", 86400)
+    app.config.setdefault("ASSETS_VERSIONED_MAX_AGE", 31536000)
 
     logging.info("-=-=-=-=-=-=-=-=-=-=-=-=-")
     logging.info("         Borealis        ")
@@ -50,29 +204,64 @@ def create_app(test_config: Optional[Dict] = None) -> "Flask":
             if "DATA_DATABASE_URL" not in test_config:
                 app.config["DATA_DATABASE_URL"] = "sqlite:///:memory:"
 
-    from services.settings_store import SettingsService
     svc = SettingsService(
         database_url=app.config["DATABASE_URL"],
         encryption_key_path=app.config["ENCRYPTION_KEY_PATH"],
     )
 
-    from services.repository import Repository
     repo = Repository(
         database_url=app.config["DATA_DATABASE_URL"]
     )
 
-    from services.jellyfin import create_client
-    jf = create_client(svc)
+    http = create_http_session()
+    jf = create_client(svc, http)
+
+    # Long-running work: initial syncs and write-behind upserts
+    background = concurrent.futures.ThreadPoolExecutor(
+        max_workers=8, thread_name_prefix="borealis-bg"
+    )
+    app.extensions["borealis_repository"] = repo
+    app.extensions["borealis_background"] = background
+    # Request-path Jellyfin fan-out, kept apart so lookups never queue
+    # behind a sync
+    lookups = concurrent.futures.ThreadPoolExecutor(
+        max_workers=4, thread_name_prefix="borealis-lookup"
+    )
+    app.extensions["borealis_lookups"] = lookups
+
+    def _run_in_background(task, *args) -> bool:
+        """
+        Run a write-side task off the request path, logging any failure.
+        Returns False if the executor has already been shut down.
+        """
+        def _wrapped() -> None:
+            try:
+                task(*args)
+            except Exception:
+                logging.exception("[ERROR] Background task failed")
+
+        try:
+            background.submit(_wrapped)
+        except RuntimeError:
+            return False
+        return True
+
+    settings_update_lock = threading.Lock()
+    # Held for the duration of an initial sync so repeated saves coalesce
+    initial_sync_inflight = threading.Lock()
+
+    def _run_initial_sync() -> None:
+        try:
+            sync.sync_initial()
+        finally:
+            initial_sync_inflight.release()
 
-    from services.sync_service import SyncService
     sync = SyncService(
         jellyfin_client=jf,
         repository=repo,
         settings_service=svc
     )
 
-    from services.sync_scheduler import SyncScheduler
-
     current_settings = svc.get()
     initial_interval = int(current_settings.get("sync_interval") or 1800)
 
@@ -83,25 +272,37 @@ def create_app(test_config: Optional[Dict] = None) -> "Flask":
 
     app.sync_scheduler = sync_scheduler
     
-    has_server = bool(
-        current_settings.get("jf_host")
-        and current_settings.get("jf_port")
-        and current_settings.get("jf_api_key")
-    )
+    has_server = server_configured(current_settings)
 
     if not app.config.get("DEBUG") and has_server:
         sync_scheduler.start()
 
-    import atexit
+    cleanup_done = threading.Event()
 
     def cleanup():
         """
-        Cleanup function called when app shuts down.
+        Cleanup function called when app shuts down. Safe to call more
+        than once; an in-flight sync delays shutdown by at most 2s.
         """
+        if cleanup_done.is_set():
+            return
+        cleanup_done.set()
         try:
             sched = getattr(app, "sync_scheduler", None)
             if sched:
-                sched.stop()
+                sched.stop(timeout=2.0)
+        except Exception:
+            pass
+        try:
+            background.shutdown(wait=False, cancel_futures=True)
+        except Exception:
+            pass
+        try:
+            lookups.shutdown(wait=False, cancel_futures=True)
+        except Exception:
+            pass
+        try:
+            jf.close()
         except Exception:
             pass
         try:
@@ -112,17 +313,169 @@ def create_app(test_config: Optional[Dict] = None) -> "Flask":
             repo.engine.dispose()
         except Exception:
             pass
+        try:
+            http.close()
+        except Exception:
+            pass
 
     atexit.register(cleanup)
 
+    def _library_item_counts(lib_ids: List[str]) -> Dict[str, int]:
+        """
+        Item counts per library: one batched request, then a parallel
+        per-library fallback for any the batch did not report.
+        """
+        if not lib_ids:
+            return {}
+        counts = dict(jf.library_counts(lib_ids).get("counts") or {})
+        missing = [i for i in lib_ids if i not in counts]
+        # One overall deadline; libraries still pending when it passes
+        # count as 0 and their queued lookups are cancelled
+        try:
+            for jf_id, stats in zip(
+                missing,
+                lookups.map(jf.library_stats, missing, timeout=6.0),
+            ):
+                counts[jf_id] = (
+                    stats.get("item_count", 0)
+                    if isinstance(stats, dict) and stats.get("ok")
+                    else 0
+                )
+        except concurrent.futures.TimeoutError:
+            logging.warning("[WARN] Library count lookups timed out")
+        for jf_id in missing:
+            counts.setdefault(jf_id, 0)
+        return counts
+
+    # (etag, folders) from the last /Library/MediaFolders response
+    media_folders_cache: List[tuple] = [(None, None)]
+
+    probe_cache: Dict[tuple, tuple] = {}
+    probe_cache_lock = threading.Lock()
+
+    def _probe_cached(host: str, port: str, token: str) -> Dict:
+        """
+        Probe Jellyfin, reusing a successful result for the same
+        credentials for 30 seconds. Failures are never cached.
+        """
+        key = (host, port, token)
+        now = time.monotonic()
+        with probe_cache_lock:
+            hit = probe_cache.get(key)
+            if hit and hit[0] > now:
+                return dict(hit[1])
+
+        result = _probe_jellyfin(http, host, port, token)
+        if result.get("ok"):
+            with probe_cache_lock:
+                if len(probe_cache) >= 8:
+                    probe_cache.clear()
+                probe_cache[key] = (now + 30.0, dict(result))
+        return result
+
+    @lru_cache(maxsize=16)
+    def _render_cached(name: str, path: str) -> str:
+        return render_template(name)
+
+    def _page(name: str) -> str:
+        """
+        Render a page template, reusing the HTML after the first render.
+        Pages only vary by request path, so that is part of the cache key.
+        """
+        if app.debug:
+            return render_template(name)
+        return _render_cached(name, request.path)
+
+    def _conditional_json(payload) -> Response:
+        """
+        JSON response tagged with a body-hash ETag. Clients revalidate on
+        every request and receive 304 Not Modified when nothing changed.
+        """
+        resp = jsonify(payload)
+        resp.add_etag()
+        resp.headers["Cache-Control"] = "private, no-cache"
+        return resp.make_conditional(request)
+
+    # Distinguishes this process's write generations from a previous run's
+    etag_boot = format(time.time_ns(), "x")
+
+    def _generation_etag(name: str, *extra) -> str:
+        """
+        ETag for data read from the repository, derived from its write
+        generation so it can be checked before running any query.
+        """
+        parts = [name, etag_boot, str(repo.write_generation)]
+        parts.extend(str(part) for part in extra)
+        return "-".join(parts)
+
+    def _tagged_json(payload, etag: str) -> Response:
+        """
+        JSON response carrying a precomputed ETag, or an empty 304 if the
+        client already holds it. Pass payload as a callable to skip
+        building it on a 304.
+        """
+        if request.if_none_match.contains(etag):
+            resp = Response(status=304)
+        else:
+            resp = jsonify(payload() if callable(payload) else payload)
+        resp.set_etag(etag)
+        resp.headers["Cache-Control"] = "private, no-cache"
+        return resp
+
+    def _asset_path(endpoint: str, filename: str) -> str:
+        if endpoint == "static":
+            return os.path.join(app.static_folder, filename)
+        if filename.startswith("js/"):
+            return os.path.join(app.static_folder, filename)
+        return os.path.join(app.root_path, "assets", filename)
+
+    @lru_cache(maxsize=128)
+    def _asset_version(path: str) -> Optional[str]:
+        try:
+            return format(int(os.stat(path).st_mtime), "x")
+        except OSError:
+            return None
+
+    @app.url_defaults
+    def _version_asset_urls(endpoint: str, values: Dict) -> None:
+        """
+        Append a ?v= file version to static and asset URLs built with
+        url_for, so they can be cached indefinitely by the browser.
+        """
+        if endpoint not in ("static", "assets") or "v" in values:
+            return
+        filename = values.get("filename")
+        if not filename:
+            return
+        path = _asset_path(endpoint, filename)
+        if app.debug:
+            _asset_version.cache_clear()
+        version = _asset_version(path)
+        if version:
+            values["v"] = version
+
+    @app.after_request
+    def _cache_versioned_assets(resp: Response) -> Response:
+        if (
+            request.endpoint in ("static", "assets")
+            and request.args.get("v")
+            and resp.status_code in (200, 304)
+        ):
+            resp.cache_control.public = True
+            resp.cache_control.max_age = app.config["ASSETS_VERSIONED_MAX_AGE"]
+            resp.cache_control.immutable = True
+        return resp
+
     @app.get("/assets/<path:filename>")
     def assets(filename: str) -> Response:
+        max_age = app.config["ASSETS_MAX_AGE"]
         if filename.startswith("js/"):
             return send_from_directory(
                 "static/js",
-                filename.removeprefix("js/")
+                filename.removeprefix("js/"),
+                max_age=max_age,
             )
-        return send_from_directory("assets", filename)
+        return send_from_directory("assets", filename, max_age=max_age)
 
     @app.get("/api/settings")
     def get_settings() -> Response:
@@ -145,20 +498,10 @@ def create_app(test_config: Optional[Dict] = None) -> "Flask":
     def update_settings() -> Response:
         payload = request.get_json(silent=True) or {}
 
-        current_settings = svc.get()
-        had_server = (
-            current_settings.get("jf_host")
-            and current_settings.get("jf_port")
-            and current_settings.get("jf_api_key")
-        )
-
-        updated = svc.update(payload)
-
-        has_server = (
-            updated.get("jf_host")
-            and updated.get("jf_port")
-            and updated.get("jf_api_key")
-        )
+        # Read-compare-update under one lock so concurrent saves cannot
+        # both see the "just configured" transition and start two syncs
+        with settings_update_lock:
+            had_server, has_server, updated = svc.update_and_diff(payload)
 
         try:
             new_interval = updated.get("sync_interval")
@@ -178,20 +521,11 @@ def create_app(test_config: Optional[Dict] = None) -> "Flask":
             except Exception:
                 logging.error("[ERROR] Failed to persist last_activity_log_sync to settings DB before initial sync")
 
-            import threading
-
-            def run_initial_sync():
-                try:
-                    sync.sync_initial()
-                except Exception:
-                    import traceback
-                    traceback.print_exc()
-
-            sync_thread = threading.Thread(
-                target=run_initial_sync,
-                daemon=True
-            )
-            sync_thread.start()
+            if initial_sync_inflight.acquire(blocking=False):
+                if not _run_in_background(_run_initial_sync):
+                    initial_sync_inflight.release()
+            else:
+                logging.info("[INFO] Initial sync already running; not starting another")
 
         return jsonify(updated), 200
 
@@ -200,196 +534,69 @@ def create_app(test_config: Optional[Dict] = None) -> "Flask":
         """
         Test Jellyfin connectivity using persisted settings.
         """
-        from urllib.request import Request, urlopen
-        from urllib.error import URLError, HTTPError
-
         settings = svc.get()
         host = (settings.get("jf_host") or "").strip()
         port = (settings.get("jf_port") or "").strip()
         token = (settings.get("jf_api_key") or "").strip()
 
         if not host or not port or not token:
-            return jsonify({
-                "ok": False,
-                "status": 400,
-                "message": "Missing host, port, or API key in settings."
-            }), 200
+            return _static_json(_ERR_MISSING_STORED), 200
 
         if not port.isdigit():
-            return jsonify({
-                "ok": False,
-                "status": 400,
-                "message": "Stored port must be numeric."
-            }), 200
-
-        scheme = "http"
-        if host.startswith(("http://", "https://")):
-            if host.startswith("https://"):
-                scheme = "https"
-                host = host.removeprefix("https://")
-            elif host.startswith("http://"):
-                scheme = "http"
-                host = host.removeprefix("http://")
-
-        url = f"{scheme}://{host}:{port}/System/Info"
+            return _static_json(_ERR_PORT_STORED), 200
 
-        req = Request(url, method="GET")
-        req.add_header("X-Emby-Token", token)
-        req.add_header("Accept", "application/json")
-
-        try:
-            with urlopen(req, timeout=3.0) as resp:
-                status = getattr(resp, "status", 200)
-                if 200 <= status < 300:
-                    return jsonify({
-                        "ok": True,
-                        "status": status,
-                        "message": "Connection successful."
-                    }), 200
-                return jsonify({
-                    "ok": False,
-                    "status": status,
-                    "message": f"Jellyfin returned status {status}."
-                }), 200
-        except HTTPError as he:
-            return jsonify({
-                "ok": False,
-                "status": he.code,
-                "message": (
-                    f"HTTP error from Jellyfin ({he.code}): "
-                    f"{he.reason or 'Unknown'}"
-                )
-            }), 200
-        except URLError as ue:
-            reason = getattr(ue, "reason", "Unknown")
-            return jsonify({
-                "ok": False,
-                "status": 0,
-                "message": f"Network error: {reason}"
-            }), 200
-        except Exception as exc:
-            return jsonify({
-                "ok": False,
-                "status": 0,
-                "message": f"Unexpected error: {str(exc)}"
-            }), 200
+        result = _probe_cached(host, port, token)
+        if result["ok"]:
+            result["message"] = "Connection successful."
+        return jsonify(result), 200
 
     @app.post("/api/test-connection-with-credentials")
     def test_connection_with_credentials() -> Response:
         """
         Test Jellyfin connectivity with provided credentials.
         """
-        from urllib.request import Request, urlopen
-        from urllib.error import URLError, HTTPError
-
         payload = request.get_json(silent=True) or {}
         host = (payload.get("jf_host") or "").strip()
         port = (payload.get("jf_port") or "").strip()
         token = (payload.get("jf_api_key") or "").strip()
 
         if not host or not port or not token:
-            return jsonify({
-                "ok": False,
-                "status": 400,
-                "message": (
-                    "Missing host, port, or API key."
-                )
-            }), 200
+            return _static_json(_ERR_MISSING_GIVEN), 200
 
         if not port.isdigit():
-            return jsonify({
-                "ok": False,
-                "status": 400,
-                "message": "Port must be numeric."
-            }), 200
-
-        # Parse host to handle http:// or https:// prefixes
-        scheme = "http"
-        if host.startswith(("http://", "https://")):
-            if host.startswith("https://"):
-                scheme = "https"
-                host = host.removeprefix("https://")
-            elif host.startswith("http://"):
-                scheme = "http"
-                host = host.removeprefix("http://")
-
-        url = f"{scheme}://{host}:{port}/System/Info"
-
-        req = Request(url, method="GET")
-        req.add_header("X-Emby-Token", token)
-        req.add_header("Accept", "application/json")
+            return _static_json(_ERR_PORT_GIVEN), 200
 
-        try:
-            with urlopen(req, timeout=3.0) as resp:
-                status = getattr(resp, "status", 200)
-                if 200 <= status < 300:
-                    return jsonify({
-                        "ok": True,
-                        "status": status,
-                    }), 200
-                return jsonify({
-                    "ok": False,
-                    "status": status,
-                    "message": (
-                        f"Jellyfin returned status {status}."
-                    )
-                }), 200
-        except HTTPError as he:
-            return jsonify({
-                "ok": False,
-                "status": he.code,
-                "message": (
-                    f"HTTP error from Jellyfin ({he.code}): "
-                    f"{he.reason or 'Unknown'}"
-                )
-            }), 200
-        except URLError as ue:
-            reason = getattr(ue, "reason", "Unknown")
-            return jsonify({
-                "ok": False,
-                "status": 0,
-                "message": f"Network error: {reason}"
-            }), 200
-        except Exception as exc:
-            return jsonify({
-                "ok": False,
-                "status": 0,
-                "message": f"Unexpected error: {str(exc)}"
-            }), 200
+        return jsonify(_probe_cached(host, port, token)), 200
 
     @app.get("/")
     def index() -> Response:
         settings = svc.get()
-        has_server = (
-            settings.get("jf_host")
-            and settings.get("jf_port")
-            and settings.get("jf_api_key")
-        )
+        has_server = server_configured(settings)
 
         if not has_server:
-            return render_template("first_start.html"), 200
+            return _page("first_start.html"), 200
 
-        return render_template("index.html"), 200
+        return _page("index.html"), 200
 
     @app.get("/first-start")
     def first_start() -> Response:
-        return render_template("first_start.html"), 200
+        return _page("first_start.html"), 200
 
     @app.get("/users")
     def users() -> Response:
-        return render_template("users.html"), 200
+        return _page("users.html"), 200
 
     @app.get("/libraries")
     def libraries() -> Response:
-        return render_template("libraries.html"), 200
+        return _page("libraries.html"), 200
 
     @app.get("/activitylog")
     def activitylog() -> Response:
-        return render_template("activitylog.html"), 200
+        return _page("activitylog.html"), 200
 
     @app.get("/settings")
     def settings() -> Response:
-        return render_template("settings.html"), 200
+        return _page("settings.html"), 200
 
     @app.get("/api/jellyfin/system-info")
     def api_jf_system_info() -> Response:
@@ -405,12 +612,8 @@ def create_app(test_config: Optional[Dict] = None) -> "Flask":
         if result and result.get("ok") and isinstance(
             result.get("data"), list
         ):
-            try:
-                from services.mappers import map_users
-                mapped = map_users(result["data"])
-                repo.upsert_users(mapped)
-            except Exception:
-                pass
+            users = result["data"]
+            _run_in_background(lambda: repo.upsert_users(map_users(users)))
         return jsonify(result), 200
 
     @app.get("/api/jellyfin/libraries")
@@ -418,7 +621,16 @@ def create_app(test_config: Optional[Dict] = None) -> "Flask":
         """
         Fetches libraries with item counts and upserts to repository.
         """
-        result = jf.libraries()
+        cached_etag, cached_folders = media_folders_cache[0]
+        result = jf.libraries(etag=cached_etag)
+        unchanged = result.get("status") == 304 and cached_folders is not None
+        if unchanged:
+            result = {
+                "ok": True,
+                "status": 200,
+                "data": [dict(lib) for lib in cached_folders],
+            }
+        new_etag = result.pop("etag", None)
 
         data = result.get("data")
         if result and result.get("ok"):
@@ -432,45 +644,19 @@ def create_app(test_config: Optional[Dict] = None) -> "Flask":
             else:
                 flat = []
 
-            try:
-                import concurrent.futures
-
-                id_map = [
-                    (idx, lib.get("Id"))
-                    for idx, lib in enumerate(flat)
-                    if lib.get("Id")
-                ]
-
-                if id_map:
-                    max_workers = min(8, len(id_map))
-                    with concurrent.futures.ThreadPoolExecutor(
-                        max_workers=max_workers
-                    ) as ex:
-                        future_to_idx = {
-                            ex.submit(jf.library_stats, jf_id): idx
-                            for idx, jf_id in id_map
-                        }
-
-                        for fut in concurrent.futures.as_completed(
-                            future_to_idx, timeout=None
-                        ):
-                            idx = future_to_idx.get(fut)
-                            try:
-                                stats = fut.result(timeout=5)
-                                flat[idx]["ItemCount"] = (
-                                    stats.get("item_count", 0)
-                                    if isinstance(stats, dict) and stats.get("ok")
-                                    else 0
-                                )
-                            except Exception:
-                                flat[idx]["ItemCount"] = 0
-            except Exception:
-                for lib in flat:
-                    lib_id = lib.get("Id")
-                    if lib_id:
-                        stats = jf.library_stats(lib_id)
-                        if stats.get("ok"):
-                            lib["ItemCount"] = stats.get("item_count", 0)
+            # Remembered only once the upsert below has stored this list,
+            # so a failed write is retried on the next request
+            snapshot = (
+                (new_etag, [dict(lib) for lib in flat])
+                if new_etag
+                else (None, None)
+            )
+
+            counts = _library_item_counts(
+                [lib.get("Id") for lib in flat if lib.get("Id")]
+            )
+            for lib in flat:
+                lib["ItemCount"] = counts.get(lib.get("Id"), 0)
 
             def _is_media_library(lib: dict) -> bool:
                 t = (lib.get("CollectionType") or lib.get("Type") or "")
@@ -482,12 +668,13 @@ def create_app(test_config: Optional[Dict] = None) -> "Flask":
             filtered = [l for l in flat if _is_media_library(l)]
             result["data"] = filtered
 
-            try:
-                from services.mappers import map_libraries
-                mapped = map_libraries(filtered)
-                repo.upsert_libraries(mapped)
-            except Exception:
-                pass
+            # Folder list unchanged since the last upsert: only counts moved
+            if not unchanged:
+                def _store_libraries() -> None:
+                    repo.upsert_libraries(map_libraries(filtered))
+                    media_folders_cache[0] = snapshot
+
+                _run_in_background(_store_libraries)
 
         return jsonify(result), 200
 
@@ -496,7 +683,10 @@ def create_app(test_config: Optional[Dict] = None) -> "Flask":
         """
         Retrieve all users from repository.
         """
-        return jsonify({"ok": True, "data": repo.list_users()}), 200
+        return _tagged_json(
+            lambda: {"ok": True, "data": repo.list_users()},
+            _generation_etag("users"),
+        )
 
     @app.get("/api/analytics/libraries")
     def api_analytics_libraries() -> Response:
@@ -505,18 +695,26 @@ def create_app(test_config: Optional[Dict] = None) -> "Flask":
         """
         settings = svc.get()
 
-        if not (
-            settings.get("jf_host")
-            and settings.get("jf_port")
-            and settings.get("jf_api_key")
-        ):
+        if not server_configured(settings):
             return jsonify({
                 "ok": True,
                 "data": []
             }), 200
 
+        # Item counts come from Jellyfin, not the repository; the minute
+        # bucket bounds how long they can be served from a client's cache
+        etag = _generation_etag("libraries", int(time.time() // 60))
+        if request.if_none_match.contains(etag):
+            return _tagged_json(None, etag)
+
         try:
             libraries = repo.list_libraries(include_archived=False)
+            counts = _library_item_counts([
+                lib["jellyfin_id"]
+                for lib in libraries
+                if lib.get("jellyfin_id")
+                and "tvshows" not in (lib.get("type") or "").lower()
+            ])
 
             for lib in libraries:
                 jf_id = lib.get("jellyfin_id")
@@ -526,11 +724,12 @@ def create_app(test_config: Optional[Dict] = None) -> "Flask":
 
                 t = (lib.get("type") or "").strip().lower()
                 if "tvshows" in t:
-                    items_res = jf.library_items(jf_id)
-                    if items_res.get("ok"):
-                        items = items_res.get("data", {}).get("Items", []) or []
-                        series = sum(1 for it in items if (it.get("Type") or "").lower() == "series")
-                        episodes = sum(1 for it in items if (it.get("Type") or "").lower() == "episode")
+                    type_res = jf.library_type_counts(
+                        jf_id, ["Series", "Episode"]
+                    )
+                    if type_res.get("ok"):
+                        series = type_res["counts"].get("Series", 0)
+                        episodes = type_res["counts"].get("Episode", 0)
                         lib["series_count"] = series
                         lib["episode_count"] = episodes
                         lib["item_count"] = series + episodes
@@ -539,13 +738,12 @@ def create_app(test_config: Optional[Dict] = None) -> "Flask":
                         lib["episode_count"] = 0
                         lib["item_count"] = 0
                 else:
-                    stats = jf.library_stats(jf_id)
-                    lib["item_count"] = stats.get("item_count", 0) if stats.get("ok") else 0
+                    lib["item_count"] = counts.get(jf_id, 0)
 
-            return jsonify({
+            return _tagged_json({
                 "ok": True,
                 "data": libraries
-            }), 200
+            }, etag)
 
         except Exception as exc:
             return jsonify({
@@ -583,8 +781,6 @@ def create_app(test_config: Optional[Dict] = None) -> "Flask":
         Return items added per library for the last 30 days.
         """
         try:
-            from datetime import datetime, timedelta
-
             days = 30
             now = int(time.time())
             cutoff = now - days * 24 * 60 * 60
@@ -601,7 +797,6 @@ def create_app(test_config: Optional[Dict] = None) -> "Flask":
             for lib in libraries:
                 counts_by_lib[lib["jellyfin_id"]] = Object = {d: 0 for d in dates}
 
-            from services.data_models import Item
             with repo._session() as session:
                 rows = (
                     session.query(Item.jellyfin_id, Item.library_id, Item.date_created)
@@ -681,9 +876,7 @@ def create_app(test_config: Optional[Dict] = None) -> "Flask":
         Retrieve the most played items across all libraries.
         """
         try:
-            limit = request.args.get("limit", 10, type=int)
-            if limit < 1 or limit > 100:
-                limit = 10
+            limit = _limit_arg(default=10, maximum=100)
 
             items = repo.get_top_items_by_plays(limit=limit)
             return jsonify({
@@ -702,9 +895,7 @@ def create_app(test_config: Optional[Dict] = None) -> "Flask":
         Retrieve the most active users by total play count.
         """
         try:
-            limit = request.args.get("limit", 10, type=int)
-            if limit < 1 or limit > 100:
-                limit = 10
+            limit = _limit_arg(default=10, maximum=100)
 
             users = repo.get_top_users_by_plays(limit=limit)
             return jsonify({
@@ -721,35 +912,54 @@ def create_app(test_config: Optional[Dict] = None) -> "Flask":
     def api_analytics_server_sync_progress() -> Response:
         """
         Get the current progress of initial activity log sync.
+
+        With ?wait=<seconds> (at most 25) a running sync is long-polled:
+        the response is held until the sync finishes or the wait expires.
         """
         try:
-            task = repo.get_latest_sync_task()
-
-            if not task or task["result"] != "RUNNING":
-                return jsonify({
+            wait = request.args.get("wait", 0, type=float)
+            if not math.isfinite(wait): # nan/inf would never time out
+                wait = 0.0
+            wait = min(max(wait, 0.0), 25.0)
+            seen = repo.tasks_finished
+            task = repo.get_running_sync_task()
+
+            # Sub-task completions wake us too; keep waiting until no
+            # sync is running at all or the wait runs out
+            deadline = time.monotonic() + wait
+            while task is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not repo.wait_for_task_finish(
+                    seen, timeout=remaining
+                ):
+                    break
+                seen = repo.tasks_finished
+                task = repo.get_running_sync_task()
+
+            if task is None:
+                return _conditional_json({
                     "ok": True,
                     "syncing": False,
                     "processed_events": 0,
                     "total_events": 0
-                }), 200
+                })
 
-            import json
             log_data = {}
             if task.get("log_json"):
                 try:
-                    log_data = json.loads(task["log_json"])
+                    log_data = app.json.loads(task["log_json"])
                 except Exception:
                     pass
 
             processed = log_data.get("items_synced", 0)
             total = log_data.get("total_events", 1)
 
-            return jsonify({
+            return _conditional_json({
                 "ok": True,
                 "syncing": True,
                 "processed_events": processed,
                 "total_events": total
-            }), 200
+            })
 
         except Exception as exc:
             return jsonify({
@@ -763,9 +973,7 @@ def create_app(test_config: Optional[Dict] = None) -> "Flask":
         Retrieve recent task log entries.
         """
         try:
-            limit = request.args.get("limit", 50, type=int)
-            if limit < 1 or limit > 500:
-                limit = 50
+            limit = _limit_arg(default=50, maximum=500)
 
             logs = repo.get_task_logs(limit=limit)
             return jsonify({"ok": True, "data": logs}), 200
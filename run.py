@@ -1,11 +1,13 @@
 """
 Load environment variables for host and port, creates the Flask app instance,
-and starts the development server.
+and starts the server. Waitress is used when installed, otherwise the Flask
+development server.
 
 Environment Variables
 ---------------------
 HOST: The interface/IP the server should bind to. Defaults to "127.0.0.1".
 PORT: The port number the server should listen on. Defaults to "2929".
+THREADS: Worker threads for the Waitress server. Defaults to "8".
 """
 
 from os import getenv
@@ -21,7 +23,14 @@ def main() -> None:
     port = int(getenv("PORT", "2929"))
 
     app = create_app()
-    app.run(host=host, port=port)
+
+    try:
+        from waitress import serve
+    except ImportError:
+        app.run(host=host, port=port, threaded=True)
+        return
+
+    serve(app, host=host, port=port, threads=int(getenv("THREADS", "8")))
 
 
 if __name__ == "__main__":
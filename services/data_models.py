@@ -3,8 +3,16 @@ Borealis analytics data.
 """
 
 from __future__ import annotations
+import json
+from operator import attrgetter
 from typing import Dict, Any
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 from sqlalchemy import (
     Column,
     Integer,
@@ -33,20 +41,22 @@ class User(Base):
     archived = Column(Boolean, default=False)
 
     __table_args__ = (
-        Index("idx_user_jellyfin_id", "jellyfin_id"),
         Index("idx_user_archived", "archived"),
         Index("idx_user_total_plays", "total_plays"),
     )
 
+    _FIELDS = (
+        "id",
+        "jellyfin_id",
+        "name",
+        "is_admin",
+        "total_plays",
+        "archived",
+    )
+    _getter = attrgetter(*_FIELDS)
+
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            "id": self.id,
-            "jellyfin_id": self.jellyfin_id,
-            "name": self.name,
-            "is_admin": self.is_admin,
-            "total_plays": self.total_plays,
-            "archived": self.archived,
-        }
+        return dict(zip(self._FIELDS, self._getter(self)))
 
 
 class Library(Base):
@@ -69,32 +79,37 @@ class Library(Base):
     total_playback_seconds = Column(BigInteger, default=0)
     last_played_item_name = Column(String(512), nullable=True)
 
-    items = relationship("Item", back_populates="library")
+    # Never loaded implicitly; query items by library_id instead
+    items = relationship(
+        "Item", back_populates="library", lazy="raise", passive_deletes=True
+    )
 
     __table_args__ = (
-        Index("idx_library_jellyfin_id", "jellyfin_id"),
         Index("idx_library_archived", "archived"),
         Index("idx_library_total_plays", "total_plays"),
         Index("idx_library_total_time_seconds", "total_time_seconds"),
         Index("idx_library_size_bytes", "size_bytes"),
     )
 
+    _FIELDS = (
+        "id",
+        "jellyfin_id",
+        "name",
+        "type",
+        "image_url",
+        "tracked",
+        "total_plays",
+        "total_time_seconds",
+        "total_files",
+        "size_bytes",
+        "total_playback_seconds",
+        "last_played_item_name",
+        "archived",
+    )
+    _getter = attrgetter(*_FIELDS)
+
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            "id": self.id,
-            "jellyfin_id": self.jellyfin_id,
-            "name": self.name,
-            "type": self.type,
-            "image_url": self.image_url,
-            "tracked": self.tracked,
-            "total_plays": self.total_plays,
-            "total_time_seconds": self.total_time_seconds,
-            "total_files": self.total_files,
-            "size_bytes": self.size_bytes,
-            "total_playback_seconds": self.total_playback_seconds,
-            "last_played_item_name": self.last_played_item_name,
-            "archived": self.archived,
-        }
+        return dict(zip(self._FIELDS, self._getter(self)))
 
 
 class Item(Base):
@@ -119,11 +134,10 @@ class Item(Base):
     size_bytes = Column(BigInteger, default=0)
     date_created = Column(BigInteger, nullable=True)
 
-    library = relationship("Library", back_populates="items")
+    library = relationship("Library", back_populates="items", lazy="raise")
 
     __table_args__ = (
-        Index("idx_item_jellyfin_id", "jellyfin_id"),
-        Index("idx_item_library_id", "library_id"),
+        Index("idx_item_lib_playcount", "library_id", "play_count"),
         Index("idx_item_archived", "archived"),
         Index("idx_item_play_count", "play_count"),
         Index("idx_item_runtime_seconds", "runtime_seconds"),
@@ -131,20 +145,23 @@ class Item(Base):
         Index("idx_date_created", "date_created")
     )
 
+    _FIELDS = (
+        "id",
+        "jellyfin_id",
+        "library_id",
+        "parent_id",
+        "name",
+        "type",
+        "play_count",
+        "runtime_seconds",
+        "size_bytes",
+        "archived",
+        "date_created",
+    )
+    _getter = attrgetter(*_FIELDS)
+
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            "id": self.id,
-            "jellyfin_id": self.jellyfin_id,
-            "library_id": self.library_id,
-            "parent_id": self.parent_id,
-            "name": self.name,
-            "type": self.type,
-            "play_count": self.play_count,
-            "runtime_seconds": self.runtime_seconds,
-            "size_bytes": self.size_bytes,
-            "archived": self.archived,
-            "date_created": self.date_created,
-        }
+        return dict(zip(self._FIELDS, self._getter(self)))
 
 
 class PlaybackActivity(Base):
@@ -166,25 +183,27 @@ class PlaybackActivity(Base):
     username_denorm = Column(String(255), nullable=True)
 
     __table_args__ = (
-        Index("idx_playback_activity_log_id", "activity_log_id"),
-        Index("idx_playback_user_id", "user_id"),
-        Index("idx_playback_item_id", "item_id"),
+        Index("idx_pa_user_time", "user_id", "activity_at"),
+        Index("idx_pa_item_time", "item_id", "activity_at"),
         Index("idx_playback_activity_at", "activity_at"),
     )
 
+    _FIELDS = (
+        "id",
+        "activity_log_id",
+        "user_id",
+        "item_id",
+        "event_name",
+        "activity_at",
+        "username_denorm",
+    )
+    _getter = attrgetter(*_FIELDS)
+
     def to_dict(self) -> Dict[str, Any]:
         """
         Serialize to dictionary for API responses.
         """
-        return {
-            "id": self.id,
-            "activity_log_id": self.activity_log_id,
-            "user_id": self.user_id,
-            "item_id": self.item_id,
-            "event_name": self.event_name,
-            "activity_at": self.activity_at,
-            "username_denorm": self.username_denorm,
-        }
+        return dict(zip(self._FIELDS, self._getter(self)))
 
 
 class TaskLog(Base):
@@ -208,14 +227,28 @@ class TaskLog(Base):
         Index("idx_task_result", "result"),
     )
 
-    def to_dict(self) -> Dict[str, Any]:
-        import json
+    def _log_data(self) -> Any:
+        """
+        Parse log_json once per stored value; unparseable text is
+        returned as-is.
+        """
+        raw = self.log_json
+        cached = self.__dict__.get("_log_cache")
+        if cached is not None and cached[0] is raw:
+            return cached[1]
+
         log_data = None
-        if self.log_json:
+        if raw:
             try:
-                log_data = json.loads(self.log_json)
-            except json.JSONDecodeError:
-                log_data = self.log_json
+                log_data = _json_loads(raw)
+            except ValueError:
+                log_data = raw
+
+        self.__dict__["_log_cache"] = (raw, log_data)
+        return log_data
+
+    def to_dict(self) -> Dict[str, Any]:
+        log_data = self._log_data()
 
         return {
             "id": self.id,
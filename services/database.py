@@ -0,0 +1,99 @@
+"""
+Shared SQLAlchemy engine construction for Borealis databases.
+"""
+
+from __future__ import annotations
+
+import threading
+import weakref
+from contextlib import nullcontext
+from typing import ContextManager
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import StaticPool
+
+# Engines whose threads all share one DBAPI connection, mapped to the
+# lock that serializes their sessions
+_SHARED_CONNECTION_LOCKS: "weakref.WeakKeyDictionary[Engine, threading.RLock]" = (
+    weakref.WeakKeyDictionary()
+)
+
+# Rows per multi-row INSERT when a sync writes a large executemany batch
+INSERT_PAGE_SIZE = 5000
+
+
+def _is_sqlite_file(database_url: str) -> bool:
+    """
+    Return True if the URL points at an on-disk SQLite database.
+    """
+    url = make_url(database_url)
+    if url.get_backend_name() != "sqlite":
+        return False
+    return bool(url.database) and url.database != ":memory:"
+
+
+def create_db_engine(database_url: str) -> Engine:
+    """
+    Create an engine for the given URL.
+
+    On-disk SQLite databases get a thread-shareable connection pool and
+    WAL journaling, so the sync threads and request handlers can read
+    while a write is in progress. In-memory SQLite uses a single shared
+    connection so every thread sees the same data; callers must hold
+    engine_lock() around each session on it. Server databases
+    check pooled connections before use.
+    """
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite" and not _is_sqlite_file(database_url):
+        # In-memory: share one connection so background threads see the
+        # same database as the request that created the tables.
+        engine = create_engine(
+            database_url,
+            future=True,
+            insertmanyvalues_page_size=INSERT_PAGE_SIZE,
+            poolclass=StaticPool,
+            connect_args={"check_same_thread": False},
+        )
+        _SHARED_CONNECTION_LOCKS[engine] = threading.RLock()
+        return engine
+
+    if not _is_sqlite_file(database_url):
+        return create_engine(
+            database_url,
+            future=True,
+            insertmanyvalues_page_size=INSERT_PAGE_SIZE,
+            pool_pre_ping=True,
+        )
+
+    engine = create_engine(
+        database_url,
+        future=True,
+        insertmanyvalues_page_size=INSERT_PAGE_SIZE,
+        pool_size=5,
+        max_overflow=10,
+        connect_args={"check_same_thread": False},
+    )
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragma(dbapi_conn, _record) -> None:
+        cur = dbapi_conn.cursor()
+        cur.execute("PRAGMA journal_mode=WAL")
+        cur.execute("PRAGMA synchronous=NORMAL")
+        cur.execute("PRAGMA temp_store=MEMORY")
+        cur.execute("PRAGMA mmap_size=268435456")
+        cur.close()
+
+    return engine
+
+
+def engine_lock(engine: Engine) -> ContextManager:
+    """
+    Return a lock to hold for the lifetime of a session on engine.
+
+    In-memory SQLite shares one connection between threads, so a commit
+    or rollback in one session would end another thread's transaction;
+    those sessions must run one at a time. Other engines hand each
+    session its own connection and need no lock.
+    """
+    return _SHARED_CONNECTION_LOCKS.get(engine) or nullcontext()
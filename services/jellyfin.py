@@ -5,14 +5,28 @@ authenticated requests to the Jellyfin REST API.
 
 from __future__ import annotations
 
+import json
+import random
+import threading
 import time
-from typing import Any, Dict, List, Optional, Tuple
-from urllib.request import Request, urlopen
-from urllib.error import HTTPError, URLError
-from urllib.parse import urlparse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import quote, urlparse
 import re
 import ipaddress
 
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 from services.settings_store import SettingsService
 
 HOSTNAME_RE = re.compile(
@@ -21,62 +35,177 @@ HOSTNAME_RE = re.compile(
     r"(?:\.[A-Za-z0-9](?:[A-Za-z0-9\-]{0,61}[A-Za-z0-9])?)*$"
     )
 
-class JellyfinClient:
-    def __init__(self, settings: SettingsService) -> None:
-        self._settings = settings
+TRANSIENT_STATUS = (408, 429, 500, 502, 503, 504) # Retryable HTTP status codes
 
-    def _read_settings(self) -> Tuple[str, str, str, str]:
-        """
-        Read settings and normalize scheme/host.
+PAGE_WORKERS = 4 # Threads shared by concurrent page fetches
+BACKOFF_CAP = 30.0 # Max seconds between retries
+BREAKER_THRESHOLD = 3 # Consecutive failed requests before failing fast
+BREAKER_COOLDOWN = 30.0 # Seconds to fail fast before probing again
 
-        :param self: Instance containing the settings provider
-        :returns Tuple[str, str, str, str]: (scheme, host, port, api_token)
-        """
-        s = self._settings.get() # Get settings dictionary
-        raw_host = (s.get("jf_host") or "").strip()
-        raw_port = (s.get("jf_port") or "").strip()
-        token = (s.get("jf_api_key") or "").strip()
-        scheme = "http"
-        host = ""
-        port = ""
-
-        if not raw_host and not raw_port: # No connection info provided
-            return scheme, host, port, token
-
-        parsed = urlparse(raw_host if "://" in raw_host else f"//{raw_host}", scheme="http") # Parse host with or without scheme
-        candidate_host = parsed.hostname or "" # Extract hostname
+ITEM_FIELDS = "MediaSources,DateCreated,ParentId" # Optional item fields read by map_item
+
+
+def _status_of(exc: requests.HTTPError) -> int:
+    """
+    Status code carried by a requests HTTPError, or 0 if unknown.
+    """
+    return exc.response.status_code if exc.response is not None else 0
+
+
+def _reason_of(exc: requests.HTTPError) -> str:
+    """
+    Reason phrase carried by a requests HTTPError.
+    """
+    reason = exc.response.reason if exc.response is not None else None
+    return reason or "Unknown"
+
+
+def create_http_session(pool_maxsize: int = 8) -> requests.Session:
+    """
+    Create a requests session that keeps connections to Jellyfin alive.
+
+    :param pool_maxsize: Max pooled connections per host
+    :returns requests.Session: Session with pooled HTTP/HTTPS adapters
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=pool_maxsize,
+        max_retries=0,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+@lru_cache(maxsize=8)
+def _normalize_connection(
+    raw_host: str, raw_port: str, token: str
+) -> Tuple[str, str, str, str]:
+    """
+    Normalize raw host/port settings into connection parts. Cached on
+    the raw values, so it only re-parses when the settings change;
+    invalid settings are cached too, as an empty host and port.
+
+    :param raw_host: Host setting, optionally with scheme and port
+    :param raw_port: Port setting
+    :param token: API token
+    :returns Tuple[str, str, str, str]: (scheme, host, port, api_token)
+    """
+    scheme = "http"
+    host = ""
+    port = ""
+
+    if not raw_host and not raw_port: # No connection info provided
+        return scheme, host, port, token
+
+    parsed = urlparse(raw_host if "://" in raw_host else f"//{raw_host}", scheme="http") # Parse host with or without scheme
+    candidate_host = parsed.hostname or "" # Extract hostname
+    try:
         candidate_port_from_host = parsed.port # Extract port
+    except ValueError: # Non-numeric or out-of-range port; cache as invalid
+        return scheme, "", "", token
 
-        if raw_port: # Explicit port takes priority
-            port = raw_port
-        elif candidate_port_from_host:
-            port = str(candidate_port_from_host)
+    if raw_port: # Explicit port takes priority
+        port = raw_port
+    elif candidate_port_from_host:
+        port = str(candidate_port_from_host)
 
-        if parsed.scheme and parsed.scheme.lower() == "https": 
-            scheme = "https"
-        elif raw_host.startswith("https://"):
-            scheme = "https"
+    if parsed.scheme and parsed.scheme.lower() == "https": 
+        scheme = "https"
+    elif raw_host.startswith("https://"):
+        scheme = "https"
 
-        host = candidate_host or raw_host
+    host = candidate_host or raw_host
 
-        if ":" in host: # Strip remaining port
-            host = host.split(":", 1)[0]
+    if ":" in host: # Strip remaining port
+        host = host.split(":", 1)[0]
 
-        host = host.strip().strip("/")
+    host = host.strip().strip("/")
 
-        valid = False
-        if host:
-            try:
-                ipaddress.ip_address(host) # Accept valid ipv4/ipv6
+    valid = False
+    if host:
+        try:
+            ipaddress.ip_address(host) # Accept valid ipv4/ipv6
+            valid = True
+        except Exception:
+            if HOSTNAME_RE.match(host):
                 valid = True
-            except Exception:
-                if HOSTNAME_RE.match(host):
-                    valid = True
 
-        if not valid: # Reject invalid host
-            return scheme, "", "", token
+    if not valid: # Reject invalid host
+        return scheme, "", "", token
 
-        return scheme, host, port, token
+    return scheme, host, port, token
+
+
+class JellyfinClient:
+    def __init__(
+        self,
+        settings: SettingsService,
+        http: Optional[requests.Session] = None,
+    ) -> None:
+        self._settings = settings
+        self._http = http or create_http_session()
+        self._breaker_lock = threading.Lock()
+        self._breaker_conn = None # Connection the failure count applies to
+        self._breaker_failures = 0
+        self._breaker_open_until = 0.0
+        self._page_pool = ThreadPoolExecutor( # Threads start on first use
+            max_workers=PAGE_WORKERS, thread_name_prefix="jf-pages"
+        )
+
+    def close(self) -> None:
+        """
+        Stop the page fetch threads, abandoning queued page requests.
+        """
+        self._page_pool.shutdown(wait=False, cancel_futures=True)
+
+    def _iter_pages(
+        self,
+        fetch: Callable[[int], Dict[str, Any]],
+        starts: Iterable[int],
+        window: int,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield fetch(start) for each start in order, keeping at most
+        window requests in flight. The next page is only requested as
+        an earlier one is handed to the caller, so a slow consumer
+        holds at most window + 1 pages in memory.
+
+        :param fetch: Function fetching the page at a start index
+        :param starts: Page start indexes, in yield order
+        :param window: Max page requests in flight
+        :returns Iterator[dict]: fetch results, in start order
+        """
+        starts = iter(starts)
+        pending = deque(
+            self._page_pool.submit(fetch, start)
+            for start in islice(starts, max(1, window))
+        )
+        try:
+            while pending:
+                result = pending.popleft().result()
+                nxt = next(starts, None)
+                if nxt is not None:
+                    pending.append(self._page_pool.submit(fetch, nxt))
+                yield result
+        finally: # Caller stopped early; drop pages not yet started
+            for future in pending:
+                future.cancel()
+
+    def _read_settings(self) -> Tuple[str, str, str, str]:
+        """
+        Read settings and normalize scheme/host.
+
+        :param self: Instance containing the settings provider
+        :returns Tuple[str, str, str, str]: (scheme, host, port, api_token)
+        """
+        s = self._settings.get() # Get settings dictionary
+        return _normalize_connection(
+            (s.get("jf_host") or "").strip(),
+            (s.get("jf_port") or "").strip(),
+            (s.get("jf_api_key") or "").strip(),
+        )
 
     def _build_url(self, scheme: str, host: str, port: int, path: str) -> str:
         """
@@ -103,9 +232,9 @@ class JellyfinClient:
         :param exc: Exception raised during HTTP or network operation
         :returns bool: True if error is retryable, False otherwise
         """
-        if isinstance(exc, HTTPError):
-            return exc.code in (408, 429, 500, 502, 503, 504) # Retryable HTTP status codes
-        if isinstance(exc, URLError):
+        if isinstance(exc, requests.HTTPError):
+            return _status_of(exc) in TRANSIENT_STATUS
+        if isinstance(exc, (requests.ConnectionError, requests.Timeout)):
             return True
         return False
 
@@ -113,7 +242,8 @@ class JellyfinClient:
         self,
         path: str,
         max_retries: int = 3,
-        backoff_base: float = 1.0
+        backoff_base: float = 1.0,
+        etag: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Perform a GET request to Jellyfin.
@@ -121,7 +251,13 @@ class JellyfinClient:
         :param path: API path to request
         :param max_retries: Max number of retry attempts
         :param backoff_base: Base delay (in sec)
-        :returns dict: Result object containing success flag, status code, and payload/error
+        :param etag: ETag from a previous response; sent as If-None-Match
+        :returns dict: Result object containing success flag, status code, and payload/error.
+            A 304 reply has status 304 and data None. Successful results
+            carry the response ETag under "etag" when the server sent one.
+            After BREAKER_THRESHOLD consecutive network or transient failures,
+            calls fail immediately for BREAKER_COOLDOWN seconds; then a
+            single call probes the server while the rest keep failing fast.
         """
         conn = self._connection()
         if not conn:
@@ -133,86 +269,149 @@ class JellyfinClient:
 
         scheme, host, port, token = conn # Retrieve settings
         url = self._build_url(scheme, host, port, path)
+        headers = {
+            "X-Emby-Token": token,
+            "Accept": "application/json",
+        }
+        if etag:
+            headers["If-None-Match"] = etag
+
+        with self._breaker_lock:
+            if self._breaker_conn != conn: # Settings changed; start over
+                self._breaker_conn = conn
+                self._breaker_failures = 0
+                self._breaker_open_until = 0.0
+            now = time.monotonic()
+            remaining = self._breaker_open_until - now
+            if remaining <= 0 and self._breaker_failures >= BREAKER_THRESHOLD:
+                # Half-open: this call probes, others keep failing fast
+                self._breaker_open_until = now + BREAKER_COOLDOWN
+        if remaining > 0:
+            return {
+                "ok": False,
+                "status": 0,
+                "message": (
+                    f"Jellyfin unreachable; retrying in {int(remaining) + 1}s"
+                ),
+            }
 
-        req = Request(url, method="GET")
-        req.add_header("X-Emby-Token", token)
-        req.add_header("Accept", "application/json")
+        result, unreachable = self._send(
+            url, headers, etag, max_retries, backoff_base
+        )
 
+        with self._breaker_lock:
+            if self._breaker_conn == conn:
+                if unreachable:
+                    self._breaker_failures += 1
+                    if self._breaker_failures >= BREAKER_THRESHOLD:
+                        self._breaker_open_until = (
+                            time.monotonic() + BREAKER_COOLDOWN
+                        )
+                elif result.get("ok") or result.get("status"): # Server answered; close the breaker
+                    self._breaker_failures = 0
+                    self._breaker_open_until = 0.0
+        return result
+
+    def _send(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        etag: Optional[str],
+        max_retries: int,
+        backoff_base: float,
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        Issue a GET with retries and jittered exponential backoff on
+        transient errors.
+
+        :param url: Full request URL
+        :param headers: Request headers
+        :param etag: ETag sent as If-None-Match, echoed back on a 304
+        :param max_retries: Max number of retry attempts
+        :param backoff_base: Base delay (in sec)
+        :returns tuple: Result object as described in _get, and whether
+            the failure came from the network or a transient status
+        """
         last_exception = None
+        delay = 0.0 # Previous backoff; decorrelated jitter grows from it
         for attempt in range(max_retries):
             try:
-                with urlopen(req, timeout=5.0) as resp: # Execute HTTP request
-                    status = getattr(resp, "status", 200)
-                    data = resp.read() # Ready response body
-                    import json
-                    try:
-                        parsed = json.loads(data.decode("utf-8"))
-                    except Exception:
-                        parsed = {}
-
-                    return { # Successful response
-                        "ok": 200 <= status < 300,
-                        "status": status,
-                        "data": parsed,
-                    }
-            except HTTPError as he: # Non-retryable HTTP error
+                resp = self._http.get(url, headers=headers, timeout=5.0) # Execute HTTP request over pooled connection
+                resp.raise_for_status()
+                status = resp.status_code
+                if status == 304: # Unchanged since the given ETag
+                    return {"ok": True, "status": 304, "data": None, "etag": etag}, False
+                try:
+                    parsed = _json_loads(resp.content)
+                except Exception:
+                    parsed = {}
+
+                result = { # Successful response
+                    "ok": 200 <= status < 300,
+                    "status": status,
+                    "data": parsed,
+                }
+                if resp.headers.get("ETag"):
+                    result["etag"] = resp.headers["ETag"]
+                return result, False
+            except requests.HTTPError as he: # Non-retryable HTTP error
                 last_exception = he
                 if not self._is_transient_error(he):
                     return {
                         "ok": False,
-                        "status": he.code,
+                        "status": _status_of(he),
                         "message": (
-                            f"HTTP error from Jellyfin ({he.code}): "
-                            f"{he.reason or 'Unknown'}"
+                            f"HTTP error from Jellyfin ({_status_of(he)}): "
+                            f"{_reason_of(he)}"
                         ),
-                    }
-            except URLError as ue: # Non-retryable network error
-                last_exception = ue
-                if not self._is_transient_error(ue):
-                    reason = getattr(ue, "reason", "Unknown")
+                    }, False
+            except requests.RequestException as ne: # Non-retryable network error
+                last_exception = ne
+                if not self._is_transient_error(ne):
                     return {
                         "ok": False,
                         "status": 0,
-                        "message": f"Network error: {reason}",
-                    }
-            except Exception as exc: # Unhandled exception
+                        "message": f"Network error: {ne}",
+                    }, True
+            except Exception as exc: # Unhandled exception; not the server's fault
                 return {
                     "ok": False,
                     "status": 0,
                     "message": f"Unexpected error: {str(exc)}",
-                }
+                }, False
 
-            if attempt < max_retries - 1: # Exp backoff before retry
-                delay = backoff_base * (2 ** attempt)
+            if attempt < max_retries - 1: # Jittered exp backoff before retry
+                delay = min(
+                    BACKOFF_CAP,
+                    random.uniform(backoff_base, max(backoff_base, delay) * 3),
+                )
                 time.sleep(delay)
 
         if last_exception:
-            if isinstance(last_exception, HTTPError): # Exhausted retries for HTTP error
+            if isinstance(last_exception, requests.HTTPError): # Exhausted retries for HTTP error
                 return {
                     "ok": False,
-                    "status": last_exception.code,
+                    "status": _status_of(last_exception),
                     "message": (
                         f"HTTP error after {max_retries} retries "
-                        f"({last_exception.code}): "
-                        f"{last_exception.reason or 'Unknown'}"
+                        f"({_status_of(last_exception)}): "
+                        f"{_reason_of(last_exception)}"
                     ),
-                }
-            elif isinstance(last_exception, URLError): # Exhausted retries for network error
-                reason = getattr(last_exception, "reason", "Unknown")
-                return {
-                    "ok": False,
-                    "status": 0,
-                    "message": (
-                        f"Network error after {max_retries} retries: "
-                        f"{reason}"
-                    ),
-                }
+                }, True
+            return { # Exhausted retries for network error
+                "ok": False,
+                "status": 0,
+                "message": (
+                    f"Network error after {max_retries} retries: "
+                    f"{last_exception}"
+                ),
+            }, True
 
         return { # Fallback if no exception captured
             "ok": False,
             "status": 0,
             "message": f"Failed after {max_retries} retries",
-        }
+        }, False
 
     def _connection(self):
         scheme, host, port, token = self._read_settings()
@@ -242,36 +441,51 @@ class JellyfinClient:
         """
         return self._get("/Users")
 
-    def libraries(self) -> Dict[str, Any]:
+    def libraries(self, etag: Optional[str] = None) -> Dict[str, Any]:
         """
         Returns media folders.
+
+        :param etag: ETag of a previously fetched folder list
+        :returns dict: Resulting object; status 304 when unchanged
         """
-        return self._get("/Library/MediaFolders")
+        return self._get("/Library/MediaFolders", etag=etag)
 
-    def library_items(self, library_id: str) -> Dict[str, Any]:
+    def _library_items_page(
+        self, library_id: str, start_index: int, page_size: int
+    ) -> Dict[str, Any]:
         """
-        Returns all items in a library.
+        Fetch one page of a library's items.
 
         :param library_id: Jellyfin library identifier
-        :returns dict: Resulting object containing success flag, status code, items
+        :param start_index: Zero-based offset of the page
+        :param page_size: Max items per request
+        :returns dict: Result object from _get
+        """
+        return self._get( # Build paginated items query
+            f"/Items?ParentId={library_id}&Recursive=true"
+            f"&Fields={ITEM_FIELDS}"
+            f"&EnableImages=false&EnableUserData=false"
+            f"&Limit={page_size}&StartIndex={start_index}"
+        )
+
+    def iter_library_items(
+        self, library_id: str, page_size: int = 1000, max_workers: int = 4
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield a library's items one page at a time, in order. The first
+        page reports TotalRecordCount; the remaining pages are then
+        fetched concurrently, with at most max_workers requests in flight.
+
+        :param library_id: Jellyfin library identifier
+        :param page_size: Max items per request
+        :param max_workers: Max page requests in flight
+        :returns Iterator[dict]: Page results containing success flag, status code,
+            and the page's previously unseen items. Iteration stops after the
+            first page that is not ok or contains no items.
         """
-        page_size = 1000 # Max items per request
-        start_index = 0
-        aggregated: List[Dict[str, Any]] = [] # Accumulated unique items
         seen_ids: set = set() # Track processed item IDs
-        last_status = 200
 
-        while True:
-            path = ( # Build paginated items query
-                f"/Items?ParentId={library_id}&Recursive=true"
-                f"&Fields=MediaSources,DateCreated"
-                f"&Limit={page_size}&StartIndex={start_index}"
-            )
-            resp = self._get(path)
-            last_status = resp.get("status", last_status) # Update status from response
-            if not resp.get("ok"):
-                return resp
-            
+        def unseen(resp: Dict[str, Any]) -> Tuple[Dict[str, Any], int, Optional[int]]:
             data = resp.get("data", {})
             if isinstance(data, dict):
                 page_items = data.get("Items", [])
@@ -283,26 +497,87 @@ class JellyfinClient:
                 page_items = []
                 total = None
 
-            new_added = 0
+            new_items: List[Dict[str, Any]] = []
             for it in page_items:
                 jf_id = (it.get("Id") or "").strip() # Extract item ID
                 if not jf_id or jf_id in seen_ids: # Skip invalid or duplicate items
                     continue
                 seen_ids.add(jf_id)
-                aggregated.append(it)
-                new_added += 1
-
-            if (total is not None and len(aggregated) >= int(total)) or len(page_items) < page_size:
-                return { # All items retrieved
-                    "ok": True,
-                    "status": last_status,
-                    "data": {
-                        "Items": aggregated,
-                        "TotalRecordCount": total if total is not None else len(aggregated),
-                        "StartIndex": 0
-                    },
-                }
-            start_index += len(page_items)
+                new_items.append(it)
+
+            page = {
+                "ok": True,
+                "status": resp.get("status", 200),
+                "data": {"Items": new_items, "TotalRecordCount": total},
+            }
+            return page, len(page_items), total
+
+        first = self._library_items_page(library_id, 0, page_size)
+        if not first.get("ok"):
+            yield first
+            return
+
+        page, received, total = unseen(first)
+        yield page
+
+        start_index = 0
+        while received == page_size and not isinstance(total, int):
+            start_index += received # No total reported; page until a short page
+            resp = self._library_items_page(library_id, start_index, page_size)
+            if not resp.get("ok"):
+                yield resp
+                return
+            page, received, _ = unseen(resp)
+            yield page
+
+        if received < page_size or not isinstance(total, int):
+            return
+
+        starts = range(page_size, total, page_size)
+        if not starts:
+            return
+
+        pages = self._iter_pages(
+            lambda start: self._library_items_page(library_id, start, page_size),
+            starts,
+            max_workers,
+        )
+        for resp in pages:
+            if not resp.get("ok"):
+                yield resp
+                return
+            page, received, _ = unseen(resp)
+            yield page
+            if not received:
+                return
+
+    def library_items(self, library_id: str) -> Dict[str, Any]:
+        """
+        Returns all items in a library.
+
+        :param library_id: Jellyfin library identifier
+        :returns dict: Resulting object containing success flag, status code, items
+        """
+        aggregated: List[Dict[str, Any]] = [] # Accumulated unique items
+        total = None
+        last_status = 200
+
+        for page in self.iter_library_items(library_id):
+            if not page.get("ok"):
+                return page
+            last_status = page.get("status", last_status)
+            aggregated.extend(page["data"]["Items"])
+            total = page["data"]["TotalRecordCount"]
+
+        return {
+            "ok": True,
+            "status": last_status,
+            "data": {
+                "Items": aggregated,
+                "TotalRecordCount": total if total is not None else len(aggregated),
+                "StartIndex": 0
+            },
+        }
 
     def library_stats(self, library_id: str) -> Dict[str, Any]:
         """
@@ -321,6 +596,57 @@ class JellyfinClient:
             }
         return {"ok": False, "item_count": 0}
     
+    def library_type_counts(
+        self, library_id: str, item_types: List[str]
+    ) -> Dict[str, Any]:
+        """
+        Returns recursive item counts per item type for a library, without
+        downloading the items themselves.
+
+        :param library_id: Jellyfin library identifier
+        :param item_types: Jellyfin item types to count (e.g. "Series")
+        :returns dict: Resulting object containing success flag and a
+            counts mapping of item type to total
+        """
+        counts: Dict[str, int] = {}
+        for item_type in item_types:
+            result = self._get(
+                f"/Items?ParentId={library_id}&Recursive=true"
+                f"&IncludeItemTypes={item_type}&Limit=0"
+            )
+            data = result.get("data")
+            if not result.get("ok") or not isinstance(data, dict):
+                return {"ok": False, "counts": {}}
+            counts[item_type] = int(data.get("TotalRecordCount") or 0)
+        return {"ok": True, "counts": counts}
+
+    def library_counts(self, library_ids: List[str]) -> Dict[str, Any]:
+        """
+        Returns child counts for several libraries in one request.
+
+        :param library_ids: Jellyfin library identifiers
+        :returns dict: Resulting object containing success flag and a
+            counts mapping of library id to item count. Libraries the
+            server did not report a count for are left out.
+        """
+        ids = [i for i in dict.fromkeys(library_ids or []) if i]
+        if not ids:
+            return {"ok": True, "counts": {}}
+
+        result = self._get(
+            f"/Items?Ids={','.join(ids)}&Fields=ChildCount"
+        )
+        data = result.get("data")
+        if not result.get("ok") or not isinstance(data, dict):
+            return {"ok": False, "counts": {}}
+
+        counts: Dict[str, int] = {}
+        for item in data.get("Items") or []:
+            jf_id = item.get("Id")
+            if jf_id in ids and isinstance(item.get("ChildCount"), int):
+                counts[jf_id] = item["ChildCount"]
+        return {"ok": True, "counts": counts}
+
     def get_activity_log(
         self,
         start_index: int = 0,
@@ -345,18 +671,70 @@ class JellyfinClient:
         )
 
         if min_date: # Apply date filter if given
-            from urllib.parse import quote
             encoded_date = quote(min_date, safe='')
             path += f"&minDate={encoded_date}"
 
         return self._get(path)
 
+    def iter_activity_log(
+        self,
+        limit: int = 500,
+        min_date: Optional[str] = None,
+        has_user_id: bool = True,
+        max_workers: int = 4,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield every activity log page in order. The first page reports
+        TotalRecordCount; the remaining pages are then fetched
+        concurrently, with at most max_workers requests in flight.
 
-def create_client(settings_service: SettingsService) -> JellyfinClient:
+        :param limit: Entries per page
+        :param min_date: Optional timestamp to filter entries from
+        :param has_user_id: Whether to include only entries associated with users
+        :param max_workers: Max page requests in flight
+        :returns Iterator[dict]: get_activity_log results, one per page. Iteration
+            stops after the first page that is not ok or contains no entries.
+        """
+        first = self.get_activity_log(0, limit, min_date, has_user_id)
+        yield first
+
+        data = first.get("data")
+        if not first.get("ok") or not isinstance(data, dict):
+            return
+        items = data.get("Items") or []
+        total = data.get("TotalRecordCount")
+        if not items or not isinstance(total, int):
+            return
+
+        starts = range(limit, total, limit)
+        if not starts:
+            return
+
+        pages = self._iter_pages(
+            lambda start: self.get_activity_log(
+                start, limit, min_date, has_user_id
+            ),
+            starts,
+            max_workers,
+        )
+        for page in pages:
+            yield page
+            page_data = page.get("data")
+            if not page.get("ok") or not (
+                isinstance(page_data, dict) and page_data.get("Items")
+            ):
+                return
+
+
+def create_client(
+    settings_service: SettingsService,
+    http: Optional[requests.Session] = None,
+) -> JellyfinClient:
     """
     Factory to create a JellyfinClient from a settings_store.
 
     :param settings_service: Settings provider containing config
+    :param http: Optional shared session; a new pooled one is created if omitted
     : returns JellyfinClient: Initialized Jellyfin client instance
     """
-    return JellyfinClient(settings_service)
\ No newline at end of file
+    return JellyfinClient(settings_service, http)
\ No newline at end of file
@@ -1,14 +1,18 @@
 from __future__ import annotations
 
+import threading
 import time
 import json
 from dataclasses import dataclass
-from typing import List, Dict, Any, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from contextlib import contextmanager
 
-from sqlalchemy import create_engine, func
+from sqlalchemy import bindparam, event, func, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import sessionmaker, Session
 
+from services.database import create_db_engine, engine_lock
 from services.data_models import (
     Base,
     User,
@@ -30,7 +34,7 @@ def _now() -> int:
     return int(time.time())
 
 
-def _safe_int(value: Any, default: int = 0) -> int:
+def _safe_int(value: Any, default: Optional[int] = 0) -> Optional[int]:
     """
     Safely coerce a value to int, returning default on failure.
     """
@@ -40,20 +44,133 @@ def _safe_int(value: Any, default: int = 0) -> int:
         return default
 
 
-def _load_existing_by_key(
+# Columns copied from mapped rows; missing keys keep the stored value
+_USER_FIELDS = ("name", "is_admin")
+_USER_DEFAULTS = {"name": "Unknown", "is_admin": False}
+
+_LIBRARY_FIELDS = ("name", "type", "image_url")
+_LIBRARY_DEFAULTS = {"name": "Unknown", "type": None, "image_url": None}
+
+_ITEM_FIELDS = (
+    "parent_id",
+    "name",
+    "type",
+    "date_created",
+    "runtime_seconds",
+    "size_bytes",
+)
+_ITEM_DEFAULTS = {
+    "parent_id": None,
+    "name": "Unknown",
+    "type": None,
+    "date_created": None,
+    "runtime_seconds": 0,
+    "size_bytes": 0,
+}
+
+_PLAYBACK_FIELDS = (
+    "user_id",
+    "item_id",
+    "event_name",
+    "activity_at",
+    "username_denorm",
+)
+_PLAYBACK_DEFAULTS = {field: None for field in _PLAYBACK_FIELDS}
+
+
+# Indexes superseded by a unique constraint or a composite index
+_REDUNDANT_INDEXES = (
+    "idx_user_jellyfin_id",
+    "idx_library_jellyfin_id",
+    "idx_item_jellyfin_id",
+    "idx_playback_activity_log_id",
+    "idx_item_library_id",
+    "idx_playback_user_id",
+    "idx_playback_item_id",
+)
+
+
+_NATIVE_UPSERT = {
+    "sqlite": sqlite_insert,
+    "postgresql": pg_insert,
+}
+
+
+def _upsert_by_key(
     session: Session,
     model,
-    key_field,
-    keys: List[Any],
-) -> Dict[Any, Any]:
+    rows: List[Dict[str, Any]],
+    update_fields: List[str],
+    key: str = "jellyfin_id",
+) -> None:
+    """
+    Insert rows keyed by a unique column, updating update_fields on
+    conflict. Rows must already be unique by key and share the same keys.
+
+    Uses a single INSERT ... ON CONFLICT DO UPDATE statement where the
+    dialect supports it, otherwise one SELECT plus Core executemany
+    INSERT and UPDATE statements.
     """
-    Load existing ORM rows keyed by a specific column.
+    if not rows:
+        return
+
+    insert_fn = _NATIVE_UPSERT.get(session.get_bind().dialect.name)
+    if insert_fn is not None:
+        stmt = insert_fn(model)
+        if update_fields:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[key],
+                set_={f: stmt.excluded[f] for f in update_fields},
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=[key])
+        session.execute(stmt, rows)
+        return
+
+    table = model.__table__
+    key_col = table.c[key]
+    existing = set(
+        session.execute(
+            select(key_col).where(key_col.in_([r[key] for r in rows]))
+        ).scalars()
+    )
+
+    new_rows: List[Dict[str, Any]] = []
+    updates: List[Dict[str, Any]] = []
+    for row in rows:
+        if row[key] in existing:
+            update = {f"b_{f}": row[f] for f in update_fields}
+            update["b_key"] = row[key]
+            updates.append(update)
+        else:
+            new_rows.append(row)
+
+    if new_rows:
+        session.execute(table.insert(), new_rows)
+
+    if updates and update_fields:
+        session.execute(
+            table.update()
+            .where(key_col == bindparam("b_key"))
+            .values({f: bindparam(f"b_{f}") for f in update_fields}),
+            updates,
+        )
+
+
+def _group_by_present_fields(
+    prepared: Dict[Any, Dict[str, Any]],
+    build_row: Callable[[Any, Dict[str, Any]], Dict[str, Any]],
+) -> Dict[Tuple[str, ...], List[Dict[str, Any]]]:
+    """
+    Group full insert rows by the fields their source actually carried.
+    Each group is upserted updating only those fields, so a field left
+    out of the input keeps its stored value.
     """
-    if not keys:
-        return {}
+    groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+    for key, fields in prepared.items():
+        groups.setdefault(tuple(fields), []).append(build_row(key, fields))
+    return groups
 
-    rows = session.query(model).filter(key_field.in_(keys)).all()
-    return {getattr(r, key_field.key): r for r in rows}
 
 @dataclass
 class Repository:
@@ -62,28 +179,103 @@ class Repository:
     """
 
     database_url: str = "sqlite:///borealis_data.db"
+    stats_cache_ttl_seconds: float = 5.0
 
     def __post_init__(self) -> None:
-        self.engine = create_engine(self.database_url, future=True)
+        self.engine = create_db_engine(self.database_url)
         self.SessionLocal = sessionmaker(
             bind=self.engine, expire_on_commit=False
         )
         Base.metadata.create_all(self.engine)
+        self._drop_redundant_indexes()
+
+        self._stats_lock = threading.Lock()
+        self._stats_cache: Dict[Any, Tuple[float, int, Any]] = {}
+        self._write_generation = 0
+        event.listen(self.engine, "after_cursor_execute", self._note_write)
+        event.listen(self.engine, "commit", self._note_commit)
+
+        # Counts task logs that left RUNNING; waiters use it to long-poll
+        self._task_finished = threading.Condition()
+        self._tasks_finished = 0
+
+    def _note_write(
+        self, conn, cursor, statement, params, context, executemany
+    ) -> None:
+        """
+        Invalidate cached stats whenever a write statement runs.
+        """
+        if context is not None and (
+            context.isinsert or context.isupdate or context.isdelete
+        ):
+            conn.info["borealis_wrote"] = True
+            self._bump_write_generation()
+
+    def _note_commit(self, conn) -> None:
+        if conn.info.pop("borealis_wrote", False):
+            self._bump_write_generation()
+
+    def _bump_write_generation(self) -> None:
+        with self._stats_lock:
+            self._write_generation += 1
+
+    @property
+    def write_generation(self) -> int:
+        """
+        Counter bumped by every write to this database. Read it before
+        querying to tag the result: an unchanged value means no write
+        has happened since.
+        """
+        with self._stats_lock:
+            return self._write_generation
+
+    def _cached_stats(
+        self, key: Any, loader: Callable[[], List[Dict[str, Any]]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Return loader() through a short-lived cache. Entries expire after
+        stats_cache_ttl_seconds or as soon as anything is written.
+        """
+        with self._stats_lock:
+            generation = self._write_generation
+            hit = self._stats_cache.get(key)
+            if (
+                hit is not None
+                and hit[1] == generation
+                and time.monotonic() - hit[0] < self.stats_cache_ttl_seconds
+            ):
+                return [dict(row) for row in hit[2]]
+
+        rows = loader()
+        with self._stats_lock:
+            if self._write_generation == generation:
+                self._stats_cache[key] = (time.monotonic(), generation, rows)
+        return [dict(row) for row in rows]
+
+    def _drop_redundant_indexes(self) -> None:
+        """
+        Remove indexes left behind by databases created before they
+        were replaced by unique constraints or composite indexes.
+        """
+        with self.engine.begin() as conn:
+            for name in _REDUNDANT_INDEXES:
+                conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
 
     @contextmanager
     def _session(self):
         """
         Context manager for database sessions with auto-commit.
         """
-        session: Session = self.SessionLocal()
-        try:
-            yield session
-            session.commit()
-        except Exception:
-            session.rollback()
-            raise
-        finally:
-            session.close()
+        with engine_lock(self.engine):
+            session: Session = self.SessionLocal()
+            try:
+                yield session
+                session.commit()
+            except Exception:
+                session.rollback()
+                raise
+            finally:
+                session.close()
 
     # -------------------------
     # Users
@@ -91,42 +283,32 @@ class Repository:
 
     def upsert_users(self, user_dicts: List[Dict[str, Any]]) -> int:
         """
-        Upsert users by jellyfin_id. Updates name and admin status.
+        Upsert users by jellyfin_id. Updates name and admin status;
+        either one missing from a row keeps its stored value.
         """
-        if not user_dicts:
+        # Keyed by jellyfin_id so repeated ids collapse to the last one
+        prepared = {
+            jf_id: {k: data[k] for k in _USER_FIELDS if k in data}
+            for data in user_dicts or []
+            if (jf_id := data.get("jellyfin_id"))
+        }
+        if not prepared:
             return 0
 
+        groups = _group_by_present_fields(
+            prepared,
+            lambda jf_id, fields: {
+                **_USER_DEFAULTS,
+                **fields,
+                "jellyfin_id": jf_id,
+                "archived": False,
+            },
+        )
         with self._session() as session:
-            existing = _load_existing_by_key(
-                session,
-                User,
-                User.jellyfin_id,
-                [d.get("jellyfin_id") for d in user_dicts if d.get("jellyfin_id")],
-            )
-
-            processed = 0
-            for data in user_dicts:
-                jf_id = data.get("jellyfin_id")
-                if not jf_id:
-                    continue
-
-                user = existing.get(jf_id)
-                if user:
-                    user.name = data.get("name", user.name)
-                    user.is_admin = data.get("is_admin", user.is_admin)
-                    user.archived = False
-                else:
-                    user = User(
-                        jellyfin_id=jf_id,
-                        name=data.get("name", "Unknown"),
-                        is_admin=data.get("is_admin", False),
-                        archived=False,
-                    )
-                    session.add(user)
-
-                processed += 1
+            for present, rows in groups.items():
+                _upsert_by_key(session, User, rows, [*present, "archived"])
 
-            return processed
+        return len(prepared)
 
     def archive_missing_users(
         self, active_jellyfin_ids: List[str]
@@ -151,11 +333,12 @@ class Repository:
         """
         Retrieve all users as dictionaries.
         """
+        stmt = select(User.__table__)
+        if not include_archived:
+            stmt = stmt.where(User.archived.is_(False))
+
         with self._session() as session:
-            query = session.query(User)
-            if not include_archived:
-                query = query.filter(User.archived.is_(False))
-            return [u.to_dict() for u in query.all()]
+            return [dict(row) for row in session.execute(stmt).mappings()]
 
     # -------------------------
     # Libraries
@@ -165,45 +348,34 @@ class Repository:
         self, library_dicts: List[Dict[str, Any]]
     ) -> int:
         """
-        Upsert libraries by jellyfin_id.
+        Upsert libraries by jellyfin_id. Fields missing from a row keep
+        their stored value.
         """
-        if not library_dicts:
+        prepared = {
+            jf_id: {k: data[k] for k in _LIBRARY_FIELDS if k in data}
+            for data in library_dicts or []
+            if (jf_id := data.get("jellyfin_id"))
+        }
+        if not prepared:
             return 0
 
+        groups = _group_by_present_fields(
+            prepared,
+            lambda jf_id, fields: {
+                **_LIBRARY_DEFAULTS,
+                **fields,
+                "jellyfin_id": jf_id,
+                "archived": False,
+            },
+        )
+        # tracked is deliberately left out so user choices survive a sync
         with self._session() as session:
-            existing = _load_existing_by_key(
-                session,
-                Library,
-                Library.jellyfin_id,
-                [d.get("jellyfin_id") for d in library_dicts if d.get("jellyfin_id")],
-            )
-
-            processed = 0
-            for data in library_dicts:
-                jf_id = data.get("jellyfin_id")
-                if not jf_id:
-                    continue
-
-                lib = existing.get(jf_id)
-                if lib:
-                    lib.name = data.get("name", lib.name)
-                    lib.type = data.get("type", lib.type)
-                    lib.image_url = data.get("image_url", lib.image_url)
-                    lib.archived = False
-                else:
-                    session.add(
-                        Library(
-                            jellyfin_id=jf_id,
-                            name=data.get("name", "Unknown"),
-                            type=data.get("type"),
-                            image_url=data.get("image_url"),
-                            archived=False,
-                        )
-                    )
-
-                processed += 1
+            for present, rows in groups.items():
+                _upsert_by_key(
+                    session, Library, rows, [*present, "archived"]
+                )
 
-            return processed
+        return len(prepared)
 
     def archive_missing_libraries(
         self, active_jellyfin_ids: List[str]
@@ -228,11 +400,12 @@ class Repository:
         """
         Retrieve all libraries as dictionaries.
         """
+        stmt = select(Library.__table__)
+        if not include_archived:
+            stmt = stmt.where(Library.archived.is_(False))
+
         with self._session() as session:
-            query = session.query(Library)
-            if not include_archived:
-                query = query.filter(Library.archived.is_(False))
-            return [l.to_dict() for l in query.all()]
+            return [dict(row) for row in session.execute(stmt).mappings()]
 
     def set_library_tracked(
         self, jellyfin_id: str, tracked: bool
@@ -240,15 +413,27 @@ class Repository:
         """
         Update the tracked flag for a library.
         """
-        with self._session() as session:
-            lib = session.query(Library).filter_by(
-                jellyfin_id=jellyfin_id
-            ).first()
-            if not lib:
-                return None
+        table = Library.__table__
+        stmt = (
+            update(table)
+            .where(table.c.jellyfin_id == jellyfin_id)
+            .values(tracked=bool(tracked))
+            .returning(*table.c)
+        )
 
-            lib.tracked = bool(tracked)
-            return lib.to_dict()
+        with self._session() as session:
+            if not session.get_bind().dialect.update_returning:
+                # SQLite older than 3.35 has no RETURNING
+                lib = session.query(Library).filter_by(
+                    jellyfin_id=jellyfin_id
+                ).first()
+                if not lib:
+                    return None
+                lib.tracked = bool(tracked)
+                return lib.to_dict()
+
+            row = session.execute(stmt).mappings().first()
+            return dict(row) if row else None
 
     # -------------------------
     # Items
@@ -256,56 +441,48 @@ class Repository:
 
     def upsert_items(self, item_dicts: List[Dict[str, Any]]) -> int:
         """
-        Upsert media items by jellyfin_id.
+        Upsert media items by jellyfin_id. Returns the number of
+        distinct items written.
         """
         if not item_dicts:
             return 0
 
+        prepared: Dict[str, Dict[str, Any]] = {}
+        library_ids: Dict[str, Any] = {}
+        for data in item_dicts:
+            jf_id = data.get("jellyfin_id")
+            if not jf_id:
+                continue
+
+            fields = {k: data[k] for k in _ITEM_FIELDS if k in data}
+            for k in ("runtime_seconds", "size_bytes"):
+                value = _safe_int(data.get(k), None)
+                if value is None:
+                    fields.pop(k, None)
+                else:
+                    fields[k] = value
+
+            prepared[jf_id] = fields
+            library_ids[jf_id] = data.get("library_id")
+
+        groups = _group_by_present_fields(
+            prepared,
+            lambda jf_id, fields: {
+                **_ITEM_DEFAULTS,
+                **fields,
+                "jellyfin_id": jf_id,
+                "library_id": library_ids[jf_id],
+                "archived": False,
+            },
+        )
+
         with self._session() as session:
-            existing = _load_existing_by_key(
-                session,
-                Item,
-                Item.jellyfin_id,
-                [d.get("jellyfin_id") for d in item_dicts if d.get("jellyfin_id")],
-            )
+            for present, rows in groups.items():
+                _upsert_by_key(
+                    session, Item, rows, [*present, "archived"]
+                )
 
-            processed = 0
-            for data in item_dicts:
-                jf_id = data.get("jellyfin_id")
-                if not jf_id:
-                    continue
-
-                item = existing.get(jf_id)
-                if item:
-                    item.parent_id = data.get("parent_id", item.parent_id)
-                    item.name = data.get("name", item.name)
-                    item.type = data.get("type", item.type)
-                    item.archived = False
-                    item.date_created = data.get("date_created", item.date_created)
-                    item.runtime_seconds = _safe_int(
-                        data.get("runtime_seconds"), item.runtime_seconds or 0
-                    )
-                    item.size_bytes = _safe_int(
-                        data.get("size_bytes"), item.size_bytes or 0
-                    )
-                else:
-                    session.add(
-                        Item(
-                            jellyfin_id=jf_id,
-                            library_id=data.get("library_id"),
-                            parent_id=data.get("parent_id"),
-                            name=data.get("name", "Unknown"),
-                            type=data.get("type"),
-                            runtime_seconds=_safe_int(data.get("runtime_seconds")),
-                            size_bytes=_safe_int(data.get("size_bytes")),
-                            archived=False,
-                            date_created=data.get("date_created"),
-                        )
-                    )
-
-                processed += 1
-
-            return processed
+        return len(prepared)
 
     def archive_missing_items(
         self, library_id: int, active_jellyfin_ids: List[str]
@@ -343,8 +520,11 @@ class Repository:
         """
         Retrieve the most played items across all libraries.
         """
-        with self._session() as session:
-            return StatsAggregator.get_top_items_by_plays(session, limit)
+        def load() -> List[Dict[str, Any]]:
+            with self._session() as session:
+                return StatsAggregator.get_top_items_by_plays(session, limit)
+
+        return self._cached_stats(("top_items", limit), load)
 
     def get_top_users_by_plays(
         self, limit: int = 10
@@ -352,8 +532,11 @@ class Repository:
         """
         Retrieve the most active users by total play count.
         """
-        with self._session() as session:
-            return StatsAggregator.get_top_users_by_plays(session, limit)
+        def load() -> List[Dict[str, Any]]:
+            with self._session() as session:
+                return StatsAggregator.get_top_users_by_plays(session, limit)
+
+        return self._cached_stats(("top_users", limit), load)
 
     def get_library_stats(
         self, include_archived: bool = False
@@ -361,11 +544,14 @@ class Repository:
         """
         Retrieve all libraries with their play count statistics.
         """
-        with self._session() as session:
-            return StatsAggregator.get_library_stats(
-                session,
-                include_archived=include_archived,
-            )
+        def load() -> List[Dict[str, Any]]:
+            with self._session() as session:
+                return StatsAggregator.get_library_stats(
+                    session,
+                    include_archived=include_archived,
+                )
+
+        return self._cached_stats(("library_stats", include_archived), load)
 
     # -------------------------
     # Playback Activity
@@ -375,53 +561,38 @@ class Repository:
         self, event_dicts: List[Dict[str, Any]]
     ) -> int:
         """
-        Insert playback activity records.
+        Insert playback activity records. Returns the number of
+        distinct activity_log_ids written.
         """
         if not event_dicts:
             return 0
 
-        with self._session() as session:
-            existing = _load_existing_by_key(
-                session,
-                PlaybackActivity,
-                PlaybackActivity.activity_log_id,
-                [
-                    d.get("activity_log_id")
-                    for d in event_dicts
-                    if d.get("activity_log_id") is not None
-                ],
-            )
+        prepared: Dict[Any, Dict[str, Any]] = {}
+        for d in event_dicts:
+            act_id = d.get("activity_log_id")
+            if not act_id:
+                continue
 
-            processed = 0
-            for d in event_dicts:
-                act_id = d.get("activity_log_id")
-                if not act_id:
-                    continue
-
-                pa = existing.get(act_id)
-                if pa:
-                    pa.user_id = d.get("user_id", pa.user_id)
-                    pa.item_id = d.get("item_id", pa.item_id)
-                    pa.event_name = d.get("event_name", pa.event_name)
-                    pa.activity_at = d.get("activity_at", pa.activity_at)
-                    pa.username_denorm = d.get(
-                        "username_denorm", pa.username_denorm
-                    )
-                else:
-                    session.add(
-                        PlaybackActivity(
-                            activity_log_id=act_id,
-                            user_id=d.get("user_id"),
-                            item_id=d.get("item_id"),
-                            event_name=d.get("event_name"),
-                            activity_at=d.get("activity_at") or _now(),
-                            username_denorm=d.get("username_denorm"),
-                        )
-                    )
+            prepared[act_id] = {k: d[k] for k in _PLAYBACK_FIELDS if k in d}
 
-                processed += 1
+        def build_row(act_id, fields: Dict[str, Any]) -> Dict[str, Any]:
+            row = {**_PLAYBACK_DEFAULTS, **fields, "activity_log_id": act_id}
+            row["activity_at"] = row["activity_at"] or _now()
+            return row
 
-            return processed
+        groups = _group_by_present_fields(prepared, build_row)
+
+        with self._session() as session:
+            for present, rows in groups.items():
+                _upsert_by_key(
+                    session,
+                    PlaybackActivity,
+                    rows,
+                    list(present),
+                    key="activity_log_id",
+                )
+
+        return len(prepared)
 
     def get_activity_logs(
         self, page: int = 1, per_page: int = 50
@@ -499,6 +670,61 @@ class Repository:
             task.result = result
             task.log_json = json.dumps(log_data) if log_data else None
 
+        with self._task_finished:
+            self._tasks_finished += 1
+            self._task_finished.notify_all()
+
+    @property
+    def tasks_finished(self) -> int:
+        """
+        Number of task logs completed so far; pass to wait_for_task_finish.
+        """
+        with self._task_finished:
+            return self._tasks_finished
+
+    def wait_for_task_finish(self, seen: int, timeout: float) -> bool:
+        """
+        Block until a task log completes after tasks_finished was seen,
+        or until timeout seconds pass. Returns True if one completed.
+        """
+        with self._task_finished:
+            return self._task_finished.wait_for(
+                lambda: self._tasks_finished != seen, timeout=timeout
+            )
+
+    def get_latest_sync_task(
+        self, execution_type: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Return the most recently started sync task row, or None.
+        Optionally limited to one execution_type.
+        """
+        table = TaskLog.__table__
+        query = select(table).where(table.c.type == "sync")
+        if execution_type is not None:
+            query = query.where(table.c.execution_type == execution_type)
+        with self._session() as session:
+            row = session.execute(
+                query
+                .order_by(table.c.started_at.desc(), table.c.id.desc())
+                .limit(1)
+            ).mappings().first()
+            return dict(row) if row else None
+
+    def get_running_sync_task(self) -> Optional[Dict[str, Any]]:
+        """
+        Return the sync task to report progress for, or None when no sync
+        is running. The initial sync runs metadata and activity sub-tasks
+        under its own row, so it counts as running between sub-tasks.
+        """
+        latest = self.get_latest_sync_task()
+        if latest and latest["result"] == "RUNNING":
+            return latest
+        initial = self.get_latest_sync_task(execution_type="initial")
+        if initial and initial["result"] == "RUNNING":
+            return initial
+        return None
+
     def get_task_logs(self, limit: int = 25) -> List[Dict[str, Any]]:
         """
         Retrieve recent task log entries ordered by start time (newest first).
@@ -4,18 +4,33 @@ Settings storage using SQLAlchemy with Fernet encryption for sensitive fields.
 
 from __future__ import annotations
 
+import threading
+import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Dict, Any, Iterator
+from typing import Optional, Dict, Any, Iterator, Tuple
 from contextlib import contextmanager
 
-from sqlalchemy import create_engine, Column, Integer, String
+from sqlalchemy import Column, Integer, String
 from sqlalchemy.orm import declarative_base, sessionmaker, Session
 from cryptography.fernet import Fernet, InvalidToken
 
+from services.database import create_db_engine, engine_lock
+
 Base = declarative_base()
 
 
+def server_configured(settings: Dict[str, Any]) -> bool:
+    """
+    Return True if host, port and a usable (decrypted) API key are set.
+    """
+    return bool(
+        settings.get("jf_host")
+        and settings.get("jf_port")
+        and settings.get("jf_api_key")
+    )
+
+
 # -------------------------
 # ORM Model
 # -------------------------
@@ -64,30 +79,36 @@ class Settings(Base):
 class SettingsService:
     database_url: str
     encryption_key_path: str
+    cache_ttl_seconds: float = 5.0
 
     def __post_init__(self) -> None:
-        self.engine = create_engine(self.database_url, future=True)
+        self.engine = create_db_engine(self.database_url)
         self.SessionLocal = sessionmaker(
             bind=self.engine,
             expire_on_commit=False,
         )
         Base.metadata.create_all(self.engine)
         self.fernet = Fernet(self._load_or_create_key())
+        self._cache_lock = threading.Lock()
+        self._cached: Optional[Dict[str, Any]] = None
+        self._cached_at = 0.0
+        self._cache_generation = 0
 
     @contextmanager
     def _session(self) -> Iterator[Session]:
         """
         Context manager for database sessions with auto-commit.
         """
-        session: Session = self.SessionLocal()
-        try:
-            yield session
-            session.commit()
-        except Exception:
-            session.rollback()
-            raise
-        finally:
-            session.close()
+        with engine_lock(self.engine):
+            session: Session = self.SessionLocal()
+            try:
+                yield session
+                session.commit()
+            except Exception:
+                session.rollback()
+                raise
+            finally:
+                session.close()
 
     def _load_or_create_key(self) -> bytes:
         """
@@ -127,16 +148,55 @@ class SettingsService:
     def get(self) -> Dict[str, Any]:
         """
         Retrieve current settings.
+
+        Results are cached for cache_ttl_seconds; callers receive a copy
+        they are free to mutate.
         """
+        with self._cache_lock:
+            if (
+                self._cached is not None
+                and time.monotonic() - self._cached_at < self.cache_ttl_seconds
+            ):
+                return dict(self._cached)
+            generation = self._cache_generation
+
         with self._session() as session:
             settings = self._get_or_create_row(session)
-            return settings.to_dict(self.fernet)
+            data = settings.to_dict(self.fernet)
+
+        self._store_cache(data, generation)
+        return dict(data)
+
+    def _store_cache(
+        self, data: Dict[str, Any], generation: Optional[int] = None
+    ) -> None:
+        """
+        Replace the cached settings snapshot. A read that started before
+        a concurrent update passes its generation and is discarded.
+        """
+        with self._cache_lock:
+            if generation is not None and generation != self._cache_generation:
+                return
+            self._cache_generation += 1
+            self._cached = dict(data)
+            self._cached_at = time.monotonic()
 
     def update(self, values: Dict[str, Any]) -> Dict[str, Any]:
         """
         Update settings. Handles encryption for jf_api_key automatically.
         Unknown keys are ignored.
         """
+        return self.update_and_diff(values)[2]
+
+    def update_and_diff(
+        self, values: Dict[str, Any]
+    ) -> Tuple[bool, bool, Dict[str, Any]]:
+        """
+        Update settings like update(), and report whether a Jellyfin
+        server (host, port and API key) was configured before and after
+        the change. Both checks happen in the same transaction as the
+        write.
+        """
         allowed = {
             "hour_format",
             "language",
@@ -149,6 +209,8 @@ class SettingsService:
 
         with self._session() as session:
             settings = self._get_or_create_row(session)
+            # A stored key that no longer decrypts does not count
+            had_server = server_configured(settings.to_dict(self.fernet))
 
             if clean.get("hour_format") in {"12", "24"}:
                 settings.hour_format = clean["hour_format"]
@@ -183,7 +245,11 @@ class SettingsService:
                 else:
                     settings.jf_api_key_encrypted = None
 
-            return settings.to_dict(self.fernet)
+            data = settings.to_dict(self.fernet)
+
+        has_server = server_configured(data)
+        self._store_cache(data)
+        return had_server, has_server, dict(data)
 
     def set_last_activity_log_sync(self, timestamp: int) -> None:
         """
@@ -75,21 +75,23 @@ class StatsAggregator:
         libraries_processed = 0
         libraries = session.query(Library).all()
 
-        for lib in libraries:
-            agg = (
-                session.query(
-                    func.count(Item.id),
-                    func.coalesce(func.sum(Item.runtime_seconds), 0),
-                    func.coalesce(func.sum(Item.size_bytes), 0),
-                    func.coalesce(func.sum(Item.runtime_seconds * Item.play_count), 0),
-                    func.coalesce(func.sum(Item.play_count), 0),
-                )
-                .filter(
-                    Item.library_id == lib.id,
-                    Item.archived.is_(False),
-                )
-                .one()
+        # One grouped pass over items instead of one SUM query per library
+        aggregates = {
+            row[0]: row[1:]
+            for row in session.query(
+                Item.library_id,
+                func.count(Item.id),
+                func.coalesce(func.sum(Item.runtime_seconds), 0),
+                func.coalesce(func.sum(Item.size_bytes), 0),
+                func.coalesce(func.sum(Item.runtime_seconds * Item.play_count), 0),
+                func.coalesce(func.sum(Item.play_count), 0),
             )
+            .filter(Item.archived.is_(False))
+            .group_by(Item.library_id)
+        }
+
+        for lib in libraries:
+            agg = aggregates.get(lib.id, (0, 0, 0, 0, 0))
 
             total_files = int(agg[0])
             total_time_seconds = int(agg[1])
@@ -150,24 +152,32 @@ class StatsAggregator:
         Retrieve the most played items across all libraries.
         """
         rows = (
-            session.query(Item, Library)
+            session.query(
+                Item.jellyfin_id,
+                Item.name,
+                Item.type,
+                Item.play_count,
+                Library.id,
+                Library.name,
+            )
             .join(Library, Item.library_id == Library.id)
             .order_by(Item.play_count.desc())
             .limit(limit)
             .all()
         )
 
-        out: List[Dict[str, Any]] = []
-        for item, library in rows:
-            out.append({
-                "item_id": item.jellyfin_id,
-                "name": item.name,
-                "type": item.type,
-                "play_count": int(item.play_count or 0),
-                "library_id": library.id,
-                "library_name": library.name,
-            })
-        return out
+        return [
+            {
+                "item_id": jf_id,
+                "name": name,
+                "type": item_type,
+                "play_count": int(play_count or 0),
+                "library_id": library_id,
+                "library_name": library_name,
+            }
+            for jf_id, name, item_type, play_count, library_id, library_name
+            in rows
+        ]
 
     @staticmethod
     def get_top_users_by_plays(
@@ -177,19 +187,19 @@ class StatsAggregator:
         """
         Retrieve the most active users by play count.
         """
-        users = (
-            session.query(User)
+        rows = (
+            session.query(User.jellyfin_id, User.name, User.total_plays)
             .order_by(User.total_plays.desc())
             .limit(limit)
             .all()
         )
         return [
             {
-                "user_id": u.jellyfin_id,
-                "name": u.name,
-                "total_plays": int(u.total_plays or 0),
+                "user_id": jf_id,
+                "name": name,
+                "total_plays": int(total_plays or 0),
             }
-            for u in users
+            for jf_id, name, total_plays in rows
         ]
 
     @staticmethod
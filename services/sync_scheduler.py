@@ -23,6 +23,7 @@ class SyncScheduler:
         self.sync_service = sync_service
         self.interval_seconds = int(interval_seconds)
         self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
         self._thread: threading.Thread | None = None
 
     def start(self) -> None:
@@ -31,6 +32,7 @@ class SyncScheduler:
             return
 
         self._stop_event.clear()
+        self._wake_event.clear()
         self._thread = threading.Thread(
             target=self._run_loop,
             daemon=True,
@@ -38,11 +40,15 @@ class SyncScheduler:
         )
         self._thread.start()
 
-    def stop(self) -> None:
-        """Stop the background sync thread."""
+    def stop(self, timeout: float | None = None) -> None:
+        """
+        Stop the background sync thread, waiting at most timeout seconds
+        for an in-flight sync to finish.
+        """
         self._stop_event.set()
+        self._wake_event.set()
         if self._thread:
-            self._thread.join()
+            self._thread.join(timeout)
         logging.info("[INFO] SyncScheduler stopped")
 
     def _run_loop(self) -> None:
@@ -52,14 +58,26 @@ class SyncScheduler:
         )
 
         while not self._stop_event.is_set():
+            last_run = time.monotonic()
             try:
                 self.sync_service.sync_periodic()
             except Exception:
                 logging.error("[ERROR] Periodic sync failed")
                 traceback.print_exc()
 
-            # Sleep until next run or stop request
-            self._stop_event.wait(self.interval_seconds)
+            self._wait_for_next_run(last_run)
+
+    def _wait_for_next_run(self, last_run: float) -> None:
+        """
+        Block until interval_seconds after last_run, waking early on stop
+        or when the interval is changed.
+        """
+        while not self._stop_event.is_set():
+            remaining = last_run + self.interval_seconds - time.monotonic()
+            if remaining <= 0:
+                return
+            if self._wake_event.wait(remaining):
+                self._wake_event.clear()
 
     def set_interval(self, seconds: int) -> None:
         """
@@ -74,4 +92,5 @@ class SyncScheduler:
             return
 
         self.interval_seconds = sec
+        self._wake_event.set()
         logging.info("[INFO] Sync interval updated to %s seconds", sec)
@@ -141,43 +141,45 @@ class SyncService:
                     lib_jf_id = lib["jellyfin_id"]
                     lib_internal_id = lib["id"]
                     
-                    items_result = self.jellyfin_client.library_items(
-                        lib_jf_id
-                    )
-                    
-                    if items_result.get("ok"):
-                        items_data = items_result.get("data", {})
-                        if isinstance(items_data, dict):
-                            items_list = items_data.get("Items", [])
-                            total_reported = items_data.get("TotalRecordCount", None)
-                        else:
-                            items_list = []
-                            total_reported = None
-                        
-                        try:
-                            mapped_items = map_items(items_list, lib_internal_id)
-                            count = self.repository.upsert_items(mapped_items)
-                            items_count += count
-
-                            active_item_ids = [it["jellyfin_id"] for it in mapped_items]
-                            self.repository.archive_missing_items(lib_internal_id, active_item_ids)
-
-                            type_counts: Dict[str, int] = {}
-                            for it in items_list:
-                                t = (it.get("Type") or it.get("TypeName") or "Unknown")
-                                type_counts[t] = type_counts.get(t, 0) + 1
-
-                        except Exception:
-                            traceback.print_exc()
-                            errors.append(
-                                f"Items processing failed for library {lib.get('name') or lib_jf_id}"
+                    # Upsert page by page so only one page of items is
+                    # held in memory at a time
+                    active_item_ids: List[str] = []
+                    failed = None
+                    try:
+                        for page in self.jellyfin_client.iter_library_items(
+                            lib_jf_id
+                        ):
+                            if not page.get("ok"):
+                                failed = page
+                                break
+
+                            mapped_items = map_items(
+                                page["data"]["Items"], lib_internal_id
+                            )
+                            items_count += self.repository.upsert_items(
+                                mapped_items
                             )
-                        
-                    else:
+                            active_item_ids.extend(
+                                it["jellyfin_id"] for it in mapped_items
+                            )
+
+                        if failed is None:
+                            self.repository.archive_missing_items(
+                                lib_internal_id, active_item_ids
+                            )
+
+                    except Exception:
+                        traceback.print_exc()
+                        errors.append(
+                            f"Items processing failed for library {lib.get('name') or lib_jf_id}"
+                        )
+                        continue
+
+                    if failed is not None:
                         errors.append(
                             f"Items sync failed for library "
                             f"{lib['name']}: "
-                            f"{items_result.get('message')}"
+                            f"{failed.get('message')}"
                         )
             else:
                 errors.append(
@@ -254,16 +256,11 @@ class SyncService:
             total_fetched = 0
             latest_event_ts: Optional[int] = None
 
-            while True:
-                # Fetch one page of activity log
-                activity_result = (
-                    self.jellyfin_client.get_activity_log(
-                        start_index=start_index,
-                        limit=page_size,
-                        has_user_id=True
-                    )
-                )
-
+            # Pages after the first are fetched concurrently, in order
+            for activity_result in self.jellyfin_client.iter_activity_log(
+                limit=page_size,
+                has_user_id=True,
+            ):
                 if not activity_result.get("ok"):
                     error_msg = (
                         f"Failed to fetch activity log at index "
@@ -193,8 +193,8 @@
 
         async function pollProgress() {
           try {
-            const r = await fetch("/api/analytics/server/sync-progress", {
-              cache: "no-store",
+            const r = await fetch("/api/analytics/server/sync-progress?wait=20", {
+              cache: "no-cache",
             });
             if (!r.ok) throw new Error("Network");
             const j = await r.json();
@@ -63,4 +63,147 @@ def test_static_logo_is_served(client) -> None:
     """
     resp = client.get("/assets/images/borealis.png")
     assert resp.status_code == 200
-    assert resp.headers.get("Content-Type", "").startswith("image/")
\ No newline at end of file
+    assert resp.headers.get("Content-Type", "").startswith("image/")
+
+def test_versioned_assets_are_cached_long_term(client) -> None:
+    """
+    Ensure url_for adds a version to static URLs and versioned requests
+    are served with a long-lived immutable Cache-Control.
+    """
+    body = client.get("/").get_data(as_text=True)
+    assert "/static/css/site.css?v=" in body
+
+    resp = client.get("/static/css/site.css?v=1")
+    assert resp.status_code == 200
+    assert resp.cache_control.immutable
+    assert resp.cache_control.max_age == 31536000
+
+    resp = client.get("/static/css/site.css")
+    assert not resp.cache_control.immutable
+
+def test_analytics_users_supports_conditional_get(client) -> None:
+    """
+    Ensure the users endpoint returns an ETag and honours If-None-Match.
+    """
+    resp = client.get("/api/analytics/users")
+    assert resp.status_code == 200
+    etag = resp.headers.get("ETag")
+    assert etag
+
+    cached = client.get(
+        "/api/analytics/users",
+        headers={"If-None-Match": etag},
+    )
+    assert cached.status_code == 304
+
+def test_sync_progress_supports_conditional_get(client) -> None:
+    """
+    Ensure repeated sync-progress polls are answered with 304 when the
+    progress has not changed.
+    """
+    resp = client.get("/api/analytics/server/sync-progress")
+    assert resp.status_code == 200
+    etag = resp.headers.get("ETag")
+    assert etag
+
+    again = client.get(
+        "/api/analytics/server/sync-progress",
+        headers={"If-None-Match": etag},
+    )
+    assert again.status_code == 304
+
+def test_json_provider_matches_default_for_dates(client) -> None:
+    """
+    Ensure datetimes and dataclasses serialize exactly as Flask's
+    default JSON provider renders them.
+    """
+    from dataclasses import dataclass
+    from datetime import date, datetime, timezone
+
+    from flask.json.provider import DefaultJSONProvider
+
+    @dataclass
+    class Point:
+        x: int
+        when: datetime
+
+    payload = {
+        "at": datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc),
+        "on": date(2024, 5, 1),
+        "point": Point(1, datetime(2024, 5, 1, tzinfo=timezone.utc)),
+    }
+    app = client.application
+    expected = DefaultJSONProvider(app).dumps(payload)
+
+    assert app.json.loads(app.json.dumps(payload)) == app.json.loads(expected)
+
+def test_sync_progress_stays_syncing_between_initial_sub_tasks(client) -> None:
+    """
+    Ensure a long-poll keeps reporting the initial sync as running when
+    one of its sub-tasks completes before the next one starts.
+    """
+    import threading
+
+    repo = client.application.extensions["borealis_repository"]
+    repo.create_task_log(
+        name="Initial Server Setup Sync",
+        task_type="sync",
+        execution_type="initial",
+    )
+    metadata_id = repo.create_task_log(
+        name="Metadata Sync", task_type="sync", execution_type="full"
+    )
+
+    timer = threading.Timer(
+        0.1, repo.complete_task_log, args=(metadata_id, "SUCCESS")
+    )
+    timer.start()
+    resp = client.get("/api/analytics/server/sync-progress?wait=1")
+    timer.join()
+
+    assert resp.status_code == 200
+    assert resp.get_json()["syncing"] is True
+
+def test_sync_progress_rejects_non_finite_wait(client) -> None:
+    """
+    Ensure ?wait=nan does not bypass the wait cap while a sync runs.
+    """
+    import time
+
+    repo = client.application.extensions["borealis_repository"]
+    repo.create_task_log(
+        name="Periodic Sync", task_type="sync", execution_type="periodic"
+    )
+
+    started = time.monotonic()
+    resp = client.get("/api/analytics/server/sync-progress?wait=nan")
+
+    assert resp.status_code == 200
+    assert resp.get_json()["syncing"] is True
+    assert time.monotonic() - started < 5.0
+
+def test_analytics_users_revalidates_without_querying(client) -> None:
+    """
+    Ensure a matching ETag is answered from the write generation alone,
+    and that a write to the repository invalidates it.
+    """
+    repo = client.application.extensions["borealis_repository"]
+    etag = client.get("/api/analytics/users").headers["ETag"]
+
+    def fail():
+        raise AssertionError("list_users should not run on a 304")
+
+    real_list_users = repo.list_users
+    repo.list_users = lambda *args, **kwargs: fail()
+    cached = client.get(
+        "/api/analytics/users", headers={"If-None-Match": etag}
+    )
+    assert cached.status_code == 304
+
+    repo.list_users = real_list_users
+    repo.upsert_users([{"jellyfin_id": "u1", "name": "alice"}])
+    changed = client.get(
+        "/api/analytics/users", headers={"If-None-Match": etag}
+    )
+    assert changed.status_code == 200
+    assert changed.get_json()["data"][0]["name"] == "alice"
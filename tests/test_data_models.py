@@ -54,4 +54,18 @@ def test_tasklog_to_dict_with_none_log() -> None:
 
     d = t.to_dict()
     assert "log" in d
-    assert d["log"] is None
\ No newline at end of file
+    assert d["log"] is None
+
+def test_tasklog_log_reparsed_after_log_json_changes() -> None:
+    t = TaskLog(
+        name="initial-sync",
+        type="sync",
+        execution_type="manual",
+        started_at=4000,
+        result="RUNNING",
+        log_json=json.dumps({"step": 1}),
+    )
+
+    assert t.to_dict()["log"] == {"step": 1}
+    t.log_json = json.dumps({"step": 2})
+    assert t.to_dict()["log"] == {"step": 2}
@@ -3,7 +3,10 @@ Tests for the Jellyfin client module.
 """
 
 import json
-from services.jellyfin import create_client
+
+import requests
+
+from services.jellyfin import BACKOFF_CAP, BREAKER_THRESHOLD, create_client
 
 
 class FakeSettings:
@@ -16,33 +19,25 @@ class FakeSettings:
 
 
 class FakeResp:
-    def __init__(self, status: int, payload):
-        self.status = status
-        self._payload = payload
-
-    def read(self) -> bytes:
-        return json.dumps(self._payload).encode("utf-8")
+    def __init__(self, status: int, payload, reason: str = "OK"):
+        self.status_code = status
+        self.reason = reason
+        self.content = json.dumps(payload).encode("utf-8")
+        self.headers = {}
 
-    def __enter__(self):
-        return self
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(response=self)
 
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        return False
 
-
-def fake_urlopen(req, timeout: float = 5.0):
-    url = getattr(req, "full_url", None)
-    if not url:
-        url = (
-            req.get_full_url() if hasattr(req, "get_full_url") else ""
-        )
+def fake_get(url, headers=None, timeout: float = 5.0):
     if url.endswith("/System/Info"):
         return FakeResp(200, {"name": "jellyfin", "version": "10.8"})
     if url.endswith("/Users"):
         return FakeResp(200, [{"Id": "1", "Name": "admin"}])
     if url.endswith("/Library/MediaFolders"):
         return FakeResp(200, [{"Id": "folder1", "Path": "/media"}])
-    return FakeResp(404, {})
+    return FakeResp(404, {}, reason="Not Found")
 
 
 def test_system_users_libraries_success(monkeypatch):
@@ -55,7 +50,7 @@ def test_system_users_libraries_success(monkeypatch):
     svc = FakeSettings()
     client = create_client(svc)
 
-    monkeypatch.setattr("services.jellyfin.urlopen", fake_urlopen)
+    monkeypatch.setattr(client._http, "get", fake_get)
 
     sys_info = client.system_info()
     assert sys_info["ok"] is True
@@ -82,20 +77,12 @@ def test_get_http_error_returns_proper_response(monkeypatch):
     :param monkeypatch: Pytest monkeypatch fixture
     :type monkeypatch: MonkeyPatch
     """
-    from urllib.error import HTTPError
-
-    def raise_http(req, timeout: float = 5.0):
-        raise HTTPError(
-            url="http://fake",
-            code=401,
-            msg="Unauthorized",
-            hdrs=None,
-            fp=None
-        )
-
-    monkeypatch.setattr("services.jellyfin.urlopen", raise_http)
+    def unauthorized(url, headers=None, timeout: float = 5.0):
+        return FakeResp(401, {}, reason="Unauthorized")
 
     client = create_client(FakeSettings())
+    monkeypatch.setattr(client._http, "get", unauthorized)
+
     res = client.system_info()
 
     assert res["ok"] is False
@@ -110,14 +97,13 @@ def test_get_url_error_returns_proper_response(monkeypatch):
     :param monkeypatch: Pytest monkeypatch fixture
     :type monkeypatch: MonkeyPatch
     """
-    from urllib.error import URLError
-
-    def raise_url(req, timeout: float = 5.0):
-        raise URLError("timed out")
-
-    monkeypatch.setattr("services.jellyfin.urlopen", raise_url)
+    def raise_url(url, headers=None, timeout: float = 5.0):
+        raise requests.ConnectionError("timed out")
 
     client = create_client(FakeSettings())
+    monkeypatch.setattr(client._http, "get", raise_url)
+    monkeypatch.setattr("services.jellyfin.time.sleep", lambda _: None)
+
     res = client.system_info()
 
     assert res["ok"] is False
@@ -185,4 +171,289 @@ def test_non_numeric_port_returns_400():
     assert res["status"] == 400
     assert "Missing or invalid host/port/token" in res.get(
         "message", ""
-    )
\ No newline at end of file
+    )
+
+def test_library_counts_batches_into_one_request(monkeypatch):
+    """
+    Test that library counts are fetched with a single request and that
+    libraries without a reported count are left out.
+
+    :param monkeypatch: Pytest monkeypatch fixture
+    :type monkeypatch: MonkeyPatch
+    """
+    client = create_client(FakeSettings())
+    calls = []
+
+    def counts_get(url, headers=None, timeout: float = 5.0):
+        calls.append(url)
+        return FakeResp(200, {"Items": [
+            {"Id": "lib1", "ChildCount": 12},
+            {"Id": "lib2"},
+        ]})
+
+    monkeypatch.setattr(client._http, "get", counts_get)
+
+    result = client.library_counts(["lib1", "lib2", "lib1"])
+    assert result["ok"] is True
+    assert result["counts"] == {"lib1": 12}
+    assert len(calls) == 1
+    assert "Ids=lib1,lib2" in calls[0]
+
+
+def test_library_type_counts_reads_totals_only(monkeypatch):
+    """
+    Test that per-type counts come from TotalRecordCount with Limit=0.
+
+    :param monkeypatch: Pytest monkeypatch fixture
+    :type monkeypatch: MonkeyPatch
+    """
+    client = create_client(FakeSettings())
+    totals = {"Series": 3, "Episode": 42}
+
+    def type_get(url, headers=None, timeout: float = 5.0):
+        assert "Limit=0" in url
+        item_type = url.split("IncludeItemTypes=")[1].split("&")[0]
+        return FakeResp(200, {"Items": [], "TotalRecordCount": totals[item_type]})
+
+    monkeypatch.setattr(client._http, "get", type_get)
+
+    result = client.library_type_counts("lib1", ["Series", "Episode"])
+    assert result == {"ok": True, "counts": {"Series": 3, "Episode": 42}}
+
+
+def test_libraries_sends_etag_and_handles_not_modified(monkeypatch):
+    """
+    Test that a stored ETag is sent as If-None-Match and a 304 reply is
+    reported as unchanged.
+
+    :param monkeypatch: Pytest monkeypatch fixture
+    :type monkeypatch: MonkeyPatch
+    """
+    client = create_client(FakeSettings())
+
+    def etag_get(url, headers=None, timeout: float = 5.0):
+        if headers.get("If-None-Match") == '"v1"':
+            return FakeResp(304, {}, reason="Not Modified")
+        resp = FakeResp(200, [{"Id": "folder1"}])
+        resp.headers["ETag"] = '"v1"'
+        return resp
+
+    monkeypatch.setattr(client._http, "get", etag_get)
+
+    first = client.libraries()
+    assert first["etag"] == '"v1"'
+
+    again = client.libraries(etag=first["etag"])
+    assert again["ok"] is True
+    assert again["status"] == 304
+    assert again["data"] is None
+
+
+def test_iter_activity_log_yields_all_pages_in_order(monkeypatch):
+    """
+    Test that activity log pages after the first are all fetched and
+    yielded in start-index order.
+
+    :param monkeypatch: Pytest monkeypatch fixture
+    :type monkeypatch: MonkeyPatch
+    """
+    client = create_client(FakeSettings())
+    entries = [{"Id": i} for i in range(25)]
+
+    def log_get(url, headers=None, timeout: float = 5.0):
+        start = int(url.split("startIndex=")[1].split("&")[0])
+        limit = int(url.split("limit=")[1].split("&")[0])
+        return FakeResp(200, {
+            "Items": entries[start:start + limit],
+            "TotalRecordCount": len(entries),
+        })
+
+    monkeypatch.setattr(client._http, "get", log_get)
+
+    pages = list(client.iter_activity_log(limit=10))
+    assert len(pages) == 3
+    ids = [e["Id"] for page in pages for e in page["data"]["Items"]]
+    assert ids == list(range(25))
+
+
+def test_iter_library_items_yields_each_page(monkeypatch):
+    """
+    Test that library items are yielded one page at a time until
+    TotalRecordCount is reached.
+
+    :param monkeypatch: Pytest monkeypatch fixture
+    :type monkeypatch: MonkeyPatch
+    """
+    client = create_client(FakeSettings())
+    items = [{"Id": f"i{i}"} for i in range(5)]
+
+    def items_get(url, headers=None, timeout: float = 5.0):
+        start = int(url.split("StartIndex=")[1].split("&")[0])
+        limit = int(url.split("Limit=")[1].split("&")[0])
+        return FakeResp(200, {
+            "Items": items[start:start + limit],
+            "TotalRecordCount": len(items),
+        })
+
+    monkeypatch.setattr(client._http, "get", items_get)
+
+    pages = list(client.iter_library_items("lib", page_size=2))
+    assert len(pages) == 3
+    ids = [it["Id"] for page in pages for it in page["data"]["Items"]]
+    assert ids == ["i0", "i1", "i2", "i3", "i4"]
+
+    aggregated = client.library_items("lib")
+    assert aggregated["data"]["TotalRecordCount"] == 5
+
+
+def test_breaker_fails_fast_after_repeated_network_errors(monkeypatch):
+    """
+    Test that consecutive network failures open the breaker so later
+    calls return without touching the network.
+
+    :param monkeypatch: Pytest monkeypatch fixture
+    :type monkeypatch: MonkeyPatch
+    """
+    calls = []
+
+    def raise_conn(url, headers=None, timeout: float = 5.0):
+        calls.append(url)
+        raise requests.ConnectionError("refused")
+
+    client = create_client(FakeSettings())
+    monkeypatch.setattr(client._http, "get", raise_conn)
+    monkeypatch.setattr("services.jellyfin.time.sleep", lambda _: None)
+
+    for _ in range(BREAKER_THRESHOLD):
+        assert "Network error" in client.system_info()["message"]
+    attempts = len(calls)
+
+    res = client.system_info()
+    assert res["ok"] is False
+    assert "unreachable" in res["message"]
+    assert len(calls) == attempts
+
+
+def test_breaker_ignores_local_errors(monkeypatch):
+    """
+    Test that exceptions raised outside requests do not open the breaker.
+
+    :param monkeypatch: Pytest monkeypatch fixture
+    :type monkeypatch: MonkeyPatch
+    """
+    calls = []
+
+    def raise_local(url, headers=None, timeout: float = 5.0):
+        calls.append(url)
+        raise ValueError("bad header")
+
+    client = create_client(FakeSettings())
+    monkeypatch.setattr(client._http, "get", raise_local)
+
+    for _ in range(BREAKER_THRESHOLD + 1):
+        assert "Unexpected error" in client.system_info()["message"]
+    assert len(calls) == BREAKER_THRESHOLD + 1
+
+
+def test_breaker_lets_one_probe_through_after_cooldown(monkeypatch):
+    """
+    Test that once the cooldown ends a single call probes the server
+    while concurrent calls keep failing fast, and success closes it.
+
+    :param monkeypatch: Pytest monkeypatch fixture
+    :type monkeypatch: MonkeyPatch
+    """
+    def raise_conn(url, headers=None, timeout: float = 5.0):
+        raise requests.ConnectionError("refused")
+
+    client = create_client(FakeSettings())
+    monkeypatch.setattr(client._http, "get", raise_conn)
+    monkeypatch.setattr("services.jellyfin.time.sleep", lambda _: None)
+    for _ in range(BREAKER_THRESHOLD):
+        client.system_info()
+
+    client._breaker_open_until = 0.0 # Cooldown elapsed
+    during_probe = []
+
+    def probe(url, headers=None, timeout: float = 5.0):
+        if not during_probe: # A second caller arrives mid-probe
+            during_probe.append(client.system_info())
+        return FakeResp(200, {"Version": "10.9"})
+
+    monkeypatch.setattr(client._http, "get", probe)
+
+    assert client.system_info()["ok"] is True
+    assert len(during_probe) == 1
+    assert "unreachable" in during_probe[0]["message"]
+    assert client._breaker_failures == 0
+    assert client.system_info()["ok"] is True
+
+
+def test_retry_backoff_is_jittered_and_capped(monkeypatch):
+    """
+    Test that retry delays stay between the base delay and the cap.
+
+    :param monkeypatch: Pytest monkeypatch fixture
+    :type monkeypatch: MonkeyPatch
+    """
+    def unavailable(url, headers=None, timeout: float = 5.0):
+        return FakeResp(503, {}, reason="Service Unavailable")
+
+    delays = []
+    client = create_client(FakeSettings())
+    monkeypatch.setattr(client._http, "get", unavailable)
+    monkeypatch.setattr("services.jellyfin.time.sleep", delays.append)
+
+    res = client._get("/System/Info", max_retries=6, backoff_base=10.0)
+
+    assert res["status"] == 503
+    assert len(delays) == 5
+    assert all(10.0 <= d <= BACKOFF_CAP for d in delays)
+
+
+def test_malformed_host_port_returns_400():
+    """
+    Test that a non-numeric port embedded in the host setting is treated
+    as invalid settings instead of raising.
+    """
+    class BadPortSettings:
+        def get(self):
+            return {"jf_host": "jellyfin.local:abc", "jf_api_key": "token123"}
+
+    client = create_client(BadPortSettings())
+    res = client.system_info()
+
+    assert res["ok"] is False
+    assert res["status"] == 400
+
+
+def test_iter_activity_log_bounds_pages_in_flight(monkeypatch):
+    """
+    Test that later activity log pages are requested only as earlier
+    ones are consumed, not all at once.
+
+    :param monkeypatch: Pytest monkeypatch fixture
+    :type monkeypatch: MonkeyPatch
+    """
+    client = create_client(FakeSettings())
+    entries = [{"Id": i} for i in range(100)]
+    requested = []
+
+    def log_get(url, headers=None, timeout: float = 5.0):
+        start = int(url.split("startIndex=")[1].split("&")[0])
+        requested.append(start)
+        return FakeResp(200, {
+            "Items": entries[start:start + 10],
+            "TotalRecordCount": len(entries),
+        })
+
+    monkeypatch.setattr(client._http, "get", log_get)
+
+    pages = client.iter_activity_log(limit=10, max_workers=2)
+    next(pages)
+    next(pages)
+    pages.close()
+    client.close()
+
+    # First page, a window of two, and one refill as page two was yielded
+    assert len(requested) <= 4
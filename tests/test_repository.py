@@ -1,6 +1,9 @@
 import json
+import threading
 import time
 
+from sqlalchemy import event
+
 from services.repository import Repository
 
 
@@ -41,4 +44,180 @@ def test_last_activity_log_sync_roundtrip() -> None:
     repo.set_last_activity_log_sync(ts)
 
     got = repo.get_last_activity_log_sync()
-    assert got == ts or got is None
\ No newline at end of file
+    assert got == ts or got is None
+
+def test_upsert_libraries_updates_in_place_and_keeps_tracked() -> None:
+    repo = Repository(database_url="sqlite:///:memory:")
+
+    assert repo.upsert_libraries([
+        {"jellyfin_id": "lib1", "name": "Movies", "type": "movies"},
+    ]) == 1
+    repo.set_library_tracked("lib1", True)
+
+    assert repo.upsert_libraries([
+        {"jellyfin_id": "lib1", "name": "Films", "type": "movies"},
+        {"jellyfin_id": "lib2", "name": "Shows", "type": "tvshows"},
+    ]) == 2
+
+    libs = {l["jellyfin_id"]: l for l in repo.list_libraries()}
+    assert len(libs) == 2
+    assert libs["lib1"]["name"] == "Films"
+    assert libs["lib1"]["tracked"] is True
+    assert libs["lib2"]["tracked"] is False
+
+
+def test_insert_playback_events_upserts_by_activity_log_id() -> None:
+    repo = Repository(database_url="sqlite:///:memory:")
+
+    event_row = {
+        "activity_log_id": 1,
+        "user_id": "u1",
+        "item_id": "i1",
+        "event_name": "Played",
+        "activity_at": 1000,
+    }
+    assert repo.insert_playback_events([event_row]) == 1
+    assert repo.insert_playback_events([
+        {**event_row, "event_name": "Replayed"},
+        {**event_row, "activity_log_id": 2},
+    ]) == 2
+
+    logs = repo.get_activity_logs(per_page=10)
+    assert logs["total"] == 2
+    names = {row["activity_log_id"]: row["event_name"] for row in logs["items"]}
+    assert names == {1: "Replayed", 2: "Played"}
+    assert repo.insert_playback_events([event_row, event_row]) == 1
+
+
+def test_list_endpoints_issue_single_query() -> None:
+    repo = Repository(database_url="sqlite:///:memory:")
+    repo.upsert_users([{"jellyfin_id": "u1", "name": "admin"}])
+    repo.upsert_libraries([
+        {"jellyfin_id": "lib1", "name": "Movies", "type": "movies"},
+        {"jellyfin_id": "lib2", "name": "Shows", "type": "tvshows"},
+    ])
+
+    statements = []
+
+    def _count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(repo.engine, "before_cursor_execute", _count)
+    try:
+        repo.list_users()
+        repo.list_libraries()
+    finally:
+        event.remove(repo.engine, "before_cursor_execute", _count)
+
+    assert len(statements) <= 2
+
+
+def test_stats_are_cached_until_a_write() -> None:
+    repo = Repository(database_url="sqlite:///:memory:")
+    repo.upsert_users([{"jellyfin_id": "u1", "name": "admin"}])
+
+    statements = []
+
+    def _count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(repo.engine, "before_cursor_execute", _count)
+    try:
+        first = repo.get_top_users_by_plays(limit=5)
+        reads = len(statements)
+        assert repo.get_top_users_by_plays(limit=5) == first
+        assert len(statements) == reads
+    finally:
+        event.remove(repo.engine, "before_cursor_execute", _count)
+
+    repo.upsert_users([{"jellyfin_id": "u2", "name": "guest"}])
+    assert {u["user_id"] for u in repo.get_top_users_by_plays(limit=5)} == {
+        "u1",
+        "u2",
+    }
+
+
+def test_completing_a_task_wakes_waiters() -> None:
+    repo = Repository(database_url="sqlite:///:memory:")
+    task_id = repo.create_task_log(
+        name="Scheduled Sync", task_type="sync", execution_type="scheduled"
+    )
+    seen = repo.tasks_finished
+
+    # Nothing completes, so the wait runs out
+    assert repo.wait_for_task_finish(seen, timeout=0.05) is False
+
+    timer = threading.Timer(
+        0.05, repo.complete_task_log, args=(task_id, "SUCCESS")
+    )
+    timer.start()
+    started = time.monotonic()
+    assert repo.wait_for_task_finish(seen, timeout=5.0) is True
+    assert time.monotonic() - started < 5.0
+    timer.join()
+
+
+def test_running_sync_task_covers_gap_between_initial_sub_tasks() -> None:
+    repo = Repository(database_url="sqlite:///:memory:")
+    initial_id = repo.create_task_log(
+        name="Initial Server Setup Sync",
+        task_type="sync",
+        execution_type="initial",
+    )
+    metadata_id = repo.create_task_log(
+        name="Metadata Sync", task_type="sync", execution_type="full"
+    )
+    assert repo.get_running_sync_task()["id"] == metadata_id
+
+    # Sub-task done, activity sub-task not yet created
+    repo.complete_task_log(task_id=metadata_id, result="SUCCESS")
+    assert repo.get_running_sync_task()["id"] == initial_id
+
+    repo.complete_task_log(task_id=initial_id, result="SUCCESS")
+    assert repo.get_running_sync_task() is None
+
+
+def test_in_memory_sessions_are_serialized_across_threads() -> None:
+    repo = Repository(database_url="sqlite:///:memory:")
+    errors = []
+
+    def write(prefix: str) -> None:
+        try:
+            for i in range(50):
+                repo.upsert_users([
+                    {"jellyfin_id": f"{prefix}{i}", "name": f"user {i}"}
+                ])
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [
+        threading.Thread(target=write, args=(prefix,)) for prefix in "abcd"
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert len(repo.list_users(include_archived=True)) == 200
+
+
+def test_upserts_keep_stored_values_for_missing_fields() -> None:
+    repo = Repository(database_url="sqlite:///:memory:")
+
+    repo.upsert_users([{"jellyfin_id": "u1", "name": "alice", "is_admin": True}])
+    repo.upsert_users([{"jellyfin_id": "u1", "name": "alice2"}])
+    user = repo.list_users(include_archived=True)[0]
+    assert (user["name"], user["is_admin"]) == ("alice2", True)
+
+    repo.upsert_libraries([{
+        "jellyfin_id": "lib1",
+        "name": "Movies",
+        "type": "movies",
+        "image_url": "/Items/lib1/Images/Primary?tag=x",
+    }])
+    repo.upsert_libraries([{"jellyfin_id": "lib1", "name": "Films"}])
+    lib = repo.list_libraries()[0]
+    assert lib["name"] == "Films"
+    assert lib["type"] == "movies"
+    assert lib["image_url"] == "/Items/lib1/Images/Primary?tag=x"
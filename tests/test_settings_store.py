@@ -25,8 +25,9 @@ def client() -> Generator:
         yield client
 
     # Cleanup
-    if os.path.exists("test_settings.db"):
-        os.remove("test_settings.db")
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(f"test_settings.db{suffix}"):
+            os.remove(f"test_settings.db{suffix}")
     if os.path.exists(key_path):
         os.remove(key_path)
 
@@ -101,4 +102,46 @@ def test_last_activity_log_sync_roundtrip() -> None:
 
     ts = 1600000000
     svc.set_last_activity_log_sync(ts)
-    assert svc.get_last_activity_log_sync() == ts
\ No newline at end of file
+    assert svc.get_last_activity_log_sync() == ts
+
+def test_update_and_diff_reports_configuration_change() -> None:
+    """
+    update_and_diff should report the before/after server configuration.
+    """
+    from services.settings_store import SettingsService
+
+    svc = SettingsService(
+        database_url="sqlite:///:memory:",
+        encryption_key_path=":memory:",
+    )
+
+    had, has, data = svc.update_and_diff({"jf_api_key": "secret"})
+    assert (had, has) == (False, True)
+    assert data["jf_api_key"] == "secret"
+
+    had, has, _ = svc.update_and_diff({"language": "en"})
+    assert (had, has) == (True, True)
+
+    had, has, _ = svc.update_and_diff({"jf_api_key": ""})
+    assert (had, has) == (True, False)
+
+
+def test_update_and_diff_ignores_undecryptable_stored_key() -> None:
+    """
+    A stored API key that no longer decrypts (e.g. after the key file
+    changed) must not count as a configured server, so re-entering
+    credentials is reported as a new configuration.
+    """
+    from cryptography.fernet import Fernet
+
+    svc = SettingsService(
+        database_url="sqlite:///:memory:",
+        encryption_key_path=":memory:",
+    )
+    svc.update_and_diff({"jf_api_key": "secret"})
+
+    svc.fernet = Fernet(Fernet.generate_key()) # Key file replaced
+
+    had, has, data = svc.update_and_diff({"jf_api_key": "secret"})
+    assert (had, has) == (False, True)
+    assert data["jf_api_key"] == "secret"
@@ -1,6 +1,7 @@
 import time
 
 from services.repository import Repository
+from services.settings_store import SettingsService
 from services.sync_service import SyncService
 
 
@@ -22,14 +23,30 @@ class FakeJellyfinClient:
     def library_items(self, library_id: str):
         return {"ok": True, "data": {"Items": []}}
 
+    def iter_library_items(self, library_id: str):
+        yield {"ok": True, "data": {"Items": [], "TotalRecordCount": 0}}
+
     def get_activity_log(self, *args, **kwargs):
         return {"ok": True, "data": []}
 
+    def iter_activity_log(self, *args, **kwargs):
+        yield {"ok": True, "data": {"Items": [], "TotalRecordCount": 0}}
 
-def test_initial_auto_tracks_media_libraries() -> None:
+
+def make_sync(fake) -> tuple:
     repo = Repository(database_url="sqlite:///:memory:")
-    fake = FakeJellyfinClient()
-    sync = SyncService(jellyfin_client=fake, repository=repo)
+    settings = SettingsService(
+        database_url="sqlite:///:memory:",
+        encryption_key_path=":memory:",
+    )
+    sync = SyncService(
+        jellyfin_client=fake, repository=repo, settings_service=settings
+    )
+    return repo, sync
+
+
+def test_initial_auto_tracks_media_libraries() -> None:
+    repo, sync = make_sync(FakeJellyfinClient())
 
     res = sync.sync_initial()
     assert res is not None
@@ -40,13 +57,36 @@ def test_initial_auto_tracks_media_libraries() -> None:
 
 
 def test_manual_full_sync_does_not_auto_track() -> None:
-    repo = Repository(database_url="sqlite:///:memory:")
-    fake = FakeJellyfinClient()
-    sync = SyncService(jellyfin_client=fake, repository=repo)
+    repo, sync = make_sync(FakeJellyfinClient())
 
     res = sync.sync_metadata(auto_track=False)
     assert res is not None
 
     libs = {l["jellyfin_id"]: l for l in repo.list_libraries()}
     assert libs["lib_movies"]["tracked"] is False
-    assert libs["lib_tv"]["tracked"] is False
\ No newline at end of file
+    assert libs["lib_tv"]["tracked"] is False
+
+def test_items_not_archived_when_a_page_fails() -> None:
+    class PageTwoFails(FakeJellyfinClient):
+        def iter_library_items(self, library_id: str):
+            yield {
+                "ok": True,
+                "data": {
+                    "Items": [{"Id": f"{library_id}-1", "Name": "First"}],
+                    "TotalRecordCount": 2,
+                },
+            }
+            yield {"ok": False, "status": 503, "message": "unavailable"}
+
+    repo, sync = make_sync(PageTwoFails())
+    archived = []
+    repo.archive_missing_items = (
+        lambda lib_id, active_ids: archived.append(lib_id)
+    )
+
+    res = sync.sync_metadata(auto_track=True)
+
+    assert res.success is False
+    assert any("Items sync failed" in e for e in res.errors)
+    assert res.items_synced > 0
+    assert archived == []
@@ -46,4 +46,27 @@ def test_sync_scheduler_start_idempotent() -> None:
     assert first_thread is second_thread
 
     sched.stop()
-    time.sleep(0.1)
\ No newline at end of file
+    time.sleep(0.1)
+
+class CountingSyncService:
+    def __init__(self):
+        self.runs = 0
+
+    def sync_periodic(self):
+        self.runs += 1
+        return SyncResultStub(success=True)
+
+
+def test_sync_scheduler_set_interval_wakes_loop() -> None:
+    svc = CountingSyncService()
+    sched = SyncScheduler(sync_service=svc, interval_seconds=3600)
+
+    sched.start()
+    time.sleep(0.1)
+    assert svc.runs == 1
+
+    sched.set_interval(1)
+    time.sleep(1.3)
+    assert svc.runs == 2
+
+    sched.stop()
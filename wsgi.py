@@ -0,0 +1,14 @@
+"""
+WSGI entry point for running Borealis under a production server.
+
+Run a single worker process (threads are fine), e.g.:
+
+    waitress-serve --threads=8 --port=2929 wsgi:application
+
+Each process starts its own background SyncScheduler, so multiple
+worker processes would sync the same server concurrently.
+"""
+
+from app import create_app
+
+application = create_app()